@@ -1,9 +1,17 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import numpy as np
 from utils.resume_parser import ResumeParser
-from utils.matcher import CandidateMatcher
+from utils.matcher import CandidateMatcher, default_weights
+from utils.batch_processor import process_resumes
+from utils.embeddings import ResumeEmbedder
+from utils.parse_cache import ParseCache, content_hash
+from utils.result_cache import ResultCache, result_key
+from utils.pipeline import RetrieveRerankPipeline
+from utils.metrics import metrics
+from utils.config import Config
+from models.candidate_model import (Candidate, CandidatePool, CANDIDATE_STATUSES, SCORE_BUCKETS,
+                                    SORTABLE_COLUMNS)
+from models.columnar_store import ColumnarCandidateStore
 import base64
 import time
 import os
@@ -39,11 +47,50 @@ def load_css():
     </style>
     """, unsafe_allow_html=True)
 
+# Built once per server process and shared by all sessions
+@st.cache_resource
+def load_parse_cache():
+    return ParseCache(parser_version=ResumeParser.version())
+
+@st.cache_resource
+def load_parser():
+    return ResumeParser(cache=load_parse_cache())
+
+@st.cache_resource
+def load_matcher():
+    # Given an embedder up front, so per-session copies share one loaded model
+    return CandidateMatcher(embedder=ResumeEmbedder())
+
+@st.cache_resource
+def load_candidate_pool():
+    return CandidatePool(Config.CANDIDATE_DB_PATH)
+
+@st.cache_resource
+def load_result_cache():
+    return ResultCache()
+
 class RecruitmentApp:
     def __init__(self):
-        self.parser = ResumeParser()
-        self.matcher = CandidateMatcher()
+        self.parser = load_parser()
+        self.matcher = load_matcher().with_weights(self.weights)
+        self.parse_cache = load_parse_cache()
+        self.candidate_pool = load_candidate_pool()
+        self.result_cache = load_result_cache()
         load_css()
+    
+    @property
+    def weights(self):
+        """Matching weights chosen on the Settings page, Config's by default"""
+        if 'weights' not in st.session_state:
+            st.session_state.weights = default_weights()
+        return st.session_state.weights
+    
+    @property
+    def dedup_threshold(self):
+        """Similarity at which an upload counts as a near-duplicate, Config's by default"""
+        if 'dedup_threshold' not in st.session_state:
+            st.session_state.dedup_threshold = Config.DEDUP_THRESHOLD
+        return st.session_state.dedup_threshold
         
     def run(self):
         # Sidebar
@@ -67,38 +114,51 @@ class RecruitmentApp:
         st.markdown('<h1 class="main-header">Smart Recruitment Dashboard</h1>', 
                    unsafe_allow_html=True)
         
+        # Running aggregates kept by the pool, so this costs the same however many candidates it holds
+        stats = self.candidate_pool.stats()
+        statuses = stats['status_counts']
+        
         # Metrics row
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Total Candidates", "156", "12%")
+            st.metric("Total Candidates", stats['total'])
         with col2:
-            st.metric("Shortlisted", "23", "8%")
+            st.metric("Shortlisted", statuses.get('Shortlisted', 0))
         with col3:
-            st.metric("Avg. Match Score", "76%", "5%")
+            st.metric("Avg. Match Score", f"{stats['average_score']:.0f}%")
         with col4:
-            st.metric("Time Saved", "42 hrs", "15%")
+            st.metric("Awaiting Review", statuses.get('New', 0))
         
         st.markdown("---")
         
-        # Charts
+        if not stats['total']:
+            st.info("No candidates yet. Match some resumes on the Candidate Matching page to fill the pool.")
+            return
+        
+        # Charts; plotly is only imported when a page actually draws one
+        import plotly.express as px
         col1, col2 = st.columns(2)
         
         with col1:
             # Skills distribution
             skills_data = {
-                'Skill': ['Python', 'Java', 'SQL', 'AWS', 'React', 'ML'],
-                'Count': [45, 32, 38, 28, 25, 20]
+                'Skill': [skill for skill, _ in stats['top_skills']],
+                'Count': [count for _, count in stats['top_skills']]
             }
             fig = px.bar(skills_data, x='Skill', y='Count', 
                         title="Top Skills Distribution", color='Count')
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
-            # Match score distribution
-            scores = [85, 92, 78, 65, 88, 72, 95, 81, 69, 87]
-            fig = px.histogram(x=scores, nbins=10, 
-                             title="Candidate Match Score Distribution")
+            # Match score distribution, already bucketed by the pool
+            width = 100 // SCORE_BUCKETS
+            histogram = {
+                'Match Score': [f"{bucket * width}-{(bucket + 1) * width}" for bucket in range(SCORE_BUCKETS)],
+                'Candidates': stats['score_histogram']
+            }
+            fig = px.bar(histogram, x='Match Score', y='Candidates',
+                         title="Candidate Match Score Distribution")
             st.plotly_chart(fig, use_container_width=True)
     
     def show_matching(self):
@@ -134,35 +194,88 @@ class RecruitmentApp:
                 self.display_results(st.session_state.matching_results)
     
     def process_matching(self, job_description, uploaded_files):
+        files = [(uploaded_file.name, uploaded_file.getbuffer()) for uploaded_file in uploaded_files]
+        weights = self.weights
+        dedup_threshold = self.dedup_threshold
+        
+        # The same job description, resumes and weights give the same results
+        key = result_key(
+            job_description, [(content_hash(data), name) for name, data in files], weights,
+            f'{ResumeParser.version()}/{self.matcher.version}/dedup={dedup_threshold}'
+        )
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            st.session_state.matching_results = cached.copy()
+            st.success(f"Loaded results for {len(cached)} resumes from the previous identical run.")
+            return
+        
         with st.spinner("Analyzing resumes and matching candidates..."):
             progress_bar = st.progress(0)
+            status_text = st.empty()
+            live_table = st.empty()
             candidates_data = []
+            start = time.perf_counter()
+            last_refresh = 0.0
             
-            for i, uploaded_file in enumerate(uploaded_files):
-                # Save uploaded file temporarily
-                file_path = f"temp_{uploaded_file.name}"
-                with open(file_path, "wb") as f:
-                    f.write(uploaded_file.getbuffer())
-                
-                # Parse resume
-                resume_data = self.parser.parse_resume(file_path)
-                resume_data['filename'] = uploaded_file.name
-                
-                # Calculate match score
-                match_result = self.matcher.calculate_match(resume_data, job_description)
+            # Scored with this session's matcher, so the weights chosen in Settings apply
+            for match_result in process_resumes(files, job_description, dedup_threshold=dedup_threshold,
+                                                parser=self.parser, matcher=self.matcher):
                 candidates_data.append(match_result)
                 
                 # Update progress
-                progress = (i + 1) / len(uploaded_files)
-                progress_bar.progress(progress)
+                progress_bar.progress(len(candidates_data) / len(files))
+                status_text.text(f"Processed {len(candidates_data)} of {len(files)}: {match_result['filename']}")
                 
-                # Clean up
-                os.remove(file_path)
+                # Redrawing the table is not free, so refresh it at most a few times a second
+                now = time.perf_counter()
+                if now - last_refresh > 0.5 or len(candidates_data) == len(files):
+                    live_table.dataframe(self.build_results_table(candidates_data), use_container_width=True)
+                    last_refresh = now
+            
+            elapsed = time.perf_counter() - start
+            status_text.empty()
+            live_table.empty()
+            
+            # Results are kept column by column: compact, and filtered or sorted without Python loops
+            results_store = ColumnarCandidateStore()
+            results_store.extend(candidates_data)
+            st.session_state.matching_results = results_store
             
-            st.session_state.matching_results = candidates_data
+            # Keep successfully processed candidates for the Candidate Pool page, once each
+            new_candidates = []
+            already_in_pool = 0
+            for result in candidates_data:
+                if 'error' in result or 'duplicate_of' in result:
+                    continue
+                candidate = Candidate.from_match_result(result)
+                if self.candidate_pool.find_duplicate(candidate, dedup_threshold) is not None:
+                    already_in_pool += 1
+                    continue
+                new_candidates.append(candidate)
+            self.candidate_pool.add_candidates(new_candidates)
+            
+            failed = sum(1 for result in candidates_data if 'error' in result)
+            if not failed:
+                # Failures may be transient (timeouts), so only complete runs are remembered
+                self.result_cache.put(key, results_store.copy())
             st.success(f"Successfully processed {len(uploaded_files)} resumes!")
+            st.caption(
+                f"Processed {len(candidates_data)} resumes in {elapsed:.2f}s "
+                f"({len(candidates_data) / elapsed if elapsed > 0 else 0:.1f} resumes/s)"
+            )
+            if failed:
+                st.warning(f"{failed} resume(s) could not be processed or timed out.")
+            duplicates = sum(1 for result in candidates_data if 'duplicate_of' in result)
+            if duplicates or already_in_pool:
+                st.info(f"{duplicates} near-duplicate resume(s) reused an earlier resume's score; "
+                        f"{already_in_pool} already in the candidate pool were not added again.")
+            truncated = sum(1 for result in candidates_data if result.get('warnings') and 'error' not in result)
+            if truncated:
+                st.info(f"{truncated} resume(s) exceeded the page or text limits and were only partly read.")
     
-    def display_results(self, results):
+    def build_results_table(self, results):
+        # pandas is only imported when a page builds a table, as plotly is for charts
+        import pandas as pd
         # Create DataFrame for display
         df_data = []
         for result in results:
@@ -175,11 +288,15 @@ class RecruitmentApp:
                 'Status': self.get_status(result['match_score'])
             })
         
-        df = pd.DataFrame(df_data)
-        
-        # Display metrics
-        avg_score = sum(r['match_score'] for r in results) / len(results)
-        top_score = max(r['match_score'] for r in results)
+        return pd.DataFrame(df_data)
+    
+    def display_results(self, store):
+        # Near-duplicates are listed under the resume they duplicate, not as candidates of their own
+        candidates = store.filter(include_duplicates=False)
+        scores = store.column('match_score')[candidates]
+        avg_score = float(scores.mean()) if len(scores) else 0.0
+        top_score = float(scores.max()) if len(scores) else 0.0
+        near_duplicates = len(store) - len(candidates)
         
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -187,29 +304,73 @@ class RecruitmentApp:
         with col2:
             st.metric("Top Score", f"{top_score:.1f}%")
         with col3:
-            st.metric("Candidates Processed", len(results))
+            st.metric("Candidates Processed", len(store),
+                      delta=f"{near_duplicates} near-duplicates" if near_duplicates else None, delta_color="off")
         
-        # Display results table
-        st.dataframe(df, use_container_width=True)
+        # Filters run over the stored columns; only the current page is ever rendered
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            search = st.text_input("Search", placeholder="Name, email or file")
+        with col2:
+            min_score = st.slider("Minimum Score", 0, 100, 0)
+        with col3:
+            required = st.text_input("Required Skills", placeholder="python, sql")
+        
+        matching = store.filter(
+            min_score=min_score or None, search=search.strip() or None,
+            all_skills=[skill.strip() for skill in required.split(',') if skill.strip()] or None,
+            include_duplicates=False
+        )
+        # The best-first order is sorted once per set of results and reused on every rerun
+        keep = np.zeros(len(store), dtype=bool)
+        keep[matching] = True
+        order = store.order('match_score')
+        rows = order[keep[order]]
+        
+        page_size = Config.RESULTS_PAGE_SIZE
+        page_count = max(1, -(-len(rows) // page_size))
+        page = st.number_input(f"Page (of {page_count})", 1, page_count, 1)
+        page_rows = rows[(page - 1) * page_size:page * page_size]
+        st.caption(f"Showing {len(page_rows)} of {len(rows)} matching candidates")
         
-        # Detailed view
+        results = store.rows(page_rows)
+        st.dataframe(self.build_results_table(results), use_container_width=True)
+        
+        # Details are built for the one candidate picked, not for every row
         st.subheader("Candidate Details")
-        for result in sorted(results, key=lambda x: x['match_score'], reverse=True):
-            with st.expander(f"{result['name']} - {result['match_score']:.1f}% Match"):
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.write(f"**Email:** {result['email']}")
-                    st.write(f"**Phone:** {result['phone']}")
-                    st.write(f"**Experience:** {result['experience']} years")
-                
-                with col2:
-                    st.write(f"**Skills Match:** {result['skills_match']:.1f}%")
-                    st.write(f"**Education:** {result['education']}")
-                
-                # Skills
-                st.write("**Key Skills:**")
-                for skill in result['skills'][:10]:
-                    st.write(f"• {skill}")
+        if not results:
+            return
+        picked = st.selectbox(
+            "Candidate", range(len(results)), index=None, placeholder="Choose a candidate on this page",
+            format_func=lambda i: f"{results[i]['name']} - {results[i]['match_score']:.1f}% Match"
+        )
+        if picked is not None:
+            self.show_result_details(store, int(page_rows[picked]))
+    
+    def show_result_details(self, store, row):
+        result = store.row(row, with_text=False)
+        for warning in result.get('warnings', []):
+            st.warning(warning)
+        copies = [store.row(int(copy), with_text=False)['filename'] for copy in store.duplicates_of(row)]
+        if copies:
+            st.caption(f"Also received as: {', '.join(copies)}")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write(f"**Email:** {result['email']}")
+            st.write(f"**Phone:** {result['phone']}")
+            st.write(f"**Experience:** {result['experience']} years")
+        
+        with col2:
+            st.write(f"**Skills Match:** {result['skills_match']:.1f}%")
+            st.write(f"**Semantic Match:** {result['semantic_match']:.1f}%")
+            st.write(f"**Keywords Match:** {result['keywords_match']:.1f}%")
+            st.write(f"**Education:** {result['education']}")
+        
+        # Skills
+        st.write("**Key Skills:**")
+        for skill in result['skills'][:10]:
+            st.write(f"• {skill}")
     
     def get_status(self, score):
         if score >= 80:
@@ -221,20 +382,199 @@ class RecruitmentApp:
     
     def show_candidate_pool(self):
         st.title("👥 Candidate Pool")
-        st.info("This feature will show all processed candidates across multiple job matches.")
+        
+        total = len(self.candidate_pool)
+        if total == 0:
+            st.info("No candidates yet. Processed candidates from Candidate Matching will appear here.")
+            return
+        
+        # Filters
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            min_score = st.slider("Minimum Match Score", 0, 100, 0)
+        with col2:
+            min_experience = st.number_input("Minimum Experience (years)", 0.0, 50.0, 0.0, step=1.0)
+        with col3:
+            status = st.selectbox("Status", ["All", *CANDIDATE_STATUSES])
+        with col4:
+            order_by = st.selectbox("Sort By", SORTABLE_COLUMNS,
+                                    format_func=lambda column: column.replace('_', ' ').title())
+        
+        filters = {
+            'min_score': min_score or None,
+            'min_experience': min_experience or None,
+            'status': None if status == "All" else status
+        }
+        matching = self.candidate_pool.count(**filters)
+        page_count = max(1, -(-matching // Config.POOL_PAGE_SIZE))
+        page = st.number_input(f"Page (of {page_count})", 1, page_count, 1)
+        
+        st.caption(f"Showing {matching} of {total} candidates")
+        
+        candidates = self.candidate_pool.query(**filters, order_by=order_by,
+                                               page=page, page_size=Config.POOL_PAGE_SIZE)
+        import pandas as pd
+        df = pd.DataFrame([{
+            'Candidate': candidate.name,
+            'Email': candidate.email,
+            'Match Score': f"{candidate.match_score:.1f}%",
+            'Experience': candidate.experience,
+            'Status': candidate.status,
+            'Applied': candidate.applied_date,
+            'File': candidate.filename
+        } for candidate in candidates])
+        st.dataframe(df, use_container_width=True)
+        
+        if candidates:
+            self.show_status_update(candidates)
+        
+        self.show_pool_search()
+    
+    def show_status_update(self, candidates):
+        # The pool keeps the dashboard's status counts in step with each change
+        by_id = {candidate.id: candidate for candidate in candidates}
+        col1, col2, col3 = st.columns([2, 1, 1])
+        with col1:
+            candidate_id = st.selectbox(
+                "Review candidate", list(by_id),
+                format_func=lambda cid: f"{by_id[cid].name} ({by_id[cid].filename}) - {by_id[cid].status}"
+            )
+        with col2:
+            new_status = st.selectbox("Set status", CANDIDATE_STATUSES)
+        with col3:
+            st.write("")
+            if st.button("Update Status"):
+                self.candidate_pool.update_status(candidate_id, new_status)
+                st.rerun()
+    
+    def show_pool_search(self):
+        st.subheader("Search Pool for a Job")
+        job_description = st.text_area("Job description to search against:", height=150)
+        skill_query = st.text_input(
+            "Required skills (optional)",
+            placeholder="python AND (django OR flask)"
+        )
+        
+        if st.button("🔍 Search Pool") and job_description:
+            job_skills = self.matcher.skill_engine.extract(job_description)
+            if not job_skills:
+                st.warning("No known skills found in the job description.")
+                return
+            
+            # Shortlist from the skill index, then fully score only the shortlist
+            pipeline = RetrieveRerankPipeline(self.matcher)
+            try:
+                results = pipeline.run_pool(self.candidate_pool, job_description, query=skill_query or None)
+            except ValueError as e:
+                st.error(f"Invalid skill query: {e}")
+                return
+            
+            stats = pipeline.last_stats
+            st.caption(f"Job skills: {', '.join(job_skills)}")
+            st.caption(
+                f"Reranked {stats['reranked']} of {stats['candidates']} candidates "
+                f"(retrieve {stats['retrieve_seconds'] * 1000:.0f} ms, "
+                f"rerank {stats['rerank_seconds'] * 1000:.0f} ms)"
+            )
+            import pandas as pd
+            st.dataframe(pd.DataFrame([{
+                'Candidate': result['name'],
+                'Email': result['email'],
+                'Match Score': f"{result['match_score']:.1f}%",
+                'Skills Match': f"{result['skills_match']:.1f}%",
+                'Experience': result['experience'],
+                'Skills': ', '.join(result['skills'][:10])
+            } for result in results[:Config.TOP_CANDIDATES_DISPLAY * 5]]), use_container_width=True)
     
     def show_settings(self):
         st.title("⚙️ System Settings")
         st.write("Configure matching parameters and system preferences.")
         
         st.subheader("Matching Weights")
-        skills_weight = st.slider("Skills Weight", 0.0, 1.0, 0.4)
-        experience_weight = st.slider("Experience Weight", 0.0, 1.0, 0.3)
-        education_weight = st.slider("Education Weight", 0.0, 1.0, 0.2)
-        keywords_weight = st.slider("Keywords Weight", 0.0, 1.0, 0.1)
+        current = self.weights
+        weights = {
+            'skills': st.slider("Skills Weight", 0.0, 1.0, current['skills']),
+            'experience': st.slider("Experience Weight", 0.0, 1.0, current['experience']),
+            'semantic': st.slider("Semantic Weight", 0.0, 1.0, current['semantic']),
+            'keywords': st.slider("Keywords Weight", 0.0, 1.0, current['keywords'])
+        }
+        st.caption("Weights are relative; they are scaled to sum to 1 when scores are combined.")
+        
+        if weights != current:
+            st.session_state.weights = weights
+            self.matcher.weights = weights
+            # Component scores are kept per result, so re-ranking needs no re-parsing or re-matching
+            if 'matching_results' in st.session_state:
+                start = time.perf_counter()
+                st.session_state.matching_results.rescore(weights)
+                st.caption(f"Re-ranked {len(st.session_state.matching_results)} results "
+                           f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+        
+        st.subheader("Near-Duplicate Resumes")
+        st.session_state.dedup_threshold = st.slider(
+            "Similarity Threshold", 0.5, 1.0, self.dedup_threshold,
+            help="Uploads at least this similar to one already processed reuse its score"
+        )
         
         if st.button("Save Settings"):
             st.success("Settings saved successfully!")
+        
+        st.subheader("Parse Cache")
+        cache_stats = self.parse_cache.stats()
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Hits", cache_stats['hits'])
+        with col2:
+            st.metric("Misses", cache_stats['misses'])
+        with col3:
+            st.metric("Hit Rate", f"{cache_stats['hit_rate'] * 100:.1f}%")
+        with col4:
+            st.metric("Size", f"{cache_stats['bytes'] / (1024 * 1024):.1f} / {cache_stats['max_bytes'] / (1024 * 1024):.0f} MB")
+        st.caption(f"{cache_stats['entries']} cached resumes, {cache_stats['evictions']} evicted")
+        
+        if st.button("Clear Parse Cache"):
+            self.parse_cache.clear()
+            st.success("Parse cache cleared!")
+        
+        st.caption(
+            f"Result cache: {len(self.result_cache)} of {self.result_cache.max_entries} matching runs remembered "
+            f"({self.result_cache.hits} hits, {self.result_cache.misses} misses)"
+        )
+        if st.button("Clear Result Cache"):
+            self.result_cache.clear()
+            st.success("Result cache cleared!")
+        
+        self.show_metrics_panel()
+    
+    def show_metrics_panel(self):
+        st.subheader("Pipeline Timings")
+        metrics.enabled = st.checkbox(
+            "Record per-stage timings", value=metrics.enabled,
+            help="Times text extraction, each field extractor and each matching component"
+        )
+        
+        rows = metrics.summary()
+        if not rows:
+            st.caption("No timings recorded yet. Enable recording and match some candidates.")
+            return
+        
+        import pandas as pd
+        st.dataframe(pd.DataFrame([{
+            'Stage': row['stage'],
+            'Calls': row['count'],
+            'Total (s)': round(row['total_seconds'], 3),
+            'Mean (ms)': round(row['mean_ms'], 3),
+            'Max (ms)': round(row['max_ms'], 3)
+        } for row in rows]), use_container_width=True)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("Download Prometheus Metrics", metrics.to_prometheus(),
+                               file_name="recruitment_metrics.prom", mime="text/plain")
+        with col2:
+            if st.button("Reset Timings"):
+                metrics.reset()
+                st.success("Timings reset!")
 
 if __name__ == "__main__":
     app = RecruitmentApp()
@@ -0,0 +1,209 @@
+"""Screen a directory of resumes against a job description without the web UI.
+
+    python -m batch_cli job.txt resumes/ --output results.jsonl
+    python -m batch_cli job.txt "incoming/**/*.pdf" --workers 8 --top-k 50
+
+One JSON line is written per resume as soon as it is scored; running the
+same command again after an interruption skips resumes already written.
+"""
+import argparse
+import glob
+import heapq
+import json
+import os
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List, Set, Tuple, Union
+
+from utils.batch_processor import process_resumes
+from utils.config import Config
+from utils.parse_cache import ParseCache
+from utils.resume_parser import ResumeParser, oversize_message
+
+# Fields written for each resume; raw_text is left out unless asked for
+RECORD_FIELDS = (
+    'name', 'email', 'phone', 'skills', 'experience', 'education', 'content_hash',
+    'match_score', 'skills_match', 'experience_match', 'semantic_match', 'keywords_match',
+    'duplicate_of', 'duplicate_similarity', 'warnings', 'error'
+)
+
+
+def find_resumes(sources: Iterable[str]) -> List[str]:
+    """Paths of resume files in the given directories and glob patterns, sorted"""
+    paths = set()
+    for source in sources:
+        if os.path.isdir(source):
+            candidates = (os.path.join(root, name) for root, _, names in os.walk(source) for name in names)
+        else:
+            candidates = glob.iglob(source, recursive=True)
+        for path in candidates:
+            if os.path.isfile(path) and os.path.splitext(path)[1].lower() in Config.ALLOWED_EXTENSIONS:
+                paths.add(os.path.normpath(path))
+    return sorted(paths)
+
+
+def read_files(paths: Iterable[str]) -> Iterator[Tuple[str, Union[bytes, Exception]]]:
+    """(path, content) pairs read as the pool asks for more; an oversized or unreadable file comes with its error"""
+    for path in paths:
+        try:
+            message = oversize_message(os.stat(path).st_size)
+            if message is not None:
+                raise ValueError(message)
+            with open(path, 'rb') as f:
+                data = f.read()
+        except (OSError, ValueError) as e:
+            data = e
+        yield path, data
+
+
+def load_checkpoint(output_path: str) -> Iterator[Dict]:
+    """Records already written to an earlier run's output, dropping a line cut short by an interruption"""
+    if not os.path.exists(output_path):
+        return
+
+    with open(output_path, 'rb+') as f:
+        offset = 0
+        cut = None  # where the last line starts, if it is cut short or unreadable
+        for line in f:
+            start, offset = offset, offset + len(line)
+            try:
+                record = json.loads(line) if line.endswith(b'\n') else None
+            except ValueError:
+                record = None
+            if not isinstance(record, dict):
+                cut = start
+                continue
+            cut = None
+            if 'file' in record:
+                yield record
+
+        if cut is not None:
+            f.truncate(cut)
+
+
+def to_record(result: Dict, include_text: bool = False) -> Dict:
+    record = {'file': result['filename']}
+    record.update({field: result[field] for field in RECORD_FIELDS if field in result})
+    if include_text:
+        record['raw_text'] = result.get('raw_text', '')
+    return record
+
+
+class TopK:
+    """The k best-scoring records seen so far, without keeping the rest"""
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap = []
+        self._seen = 0
+
+    def add(self, record: Dict):
+        # Near-duplicates share their original's score and would only repeat it
+        if self.k <= 0 or 'error' in record or 'duplicate_of' in record:
+            return
+        self._seen += 1
+        # The counter breaks score ties without comparing dicts
+        entry = (record.get('match_score', 0.0), -self._seen, record)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def best(self) -> List[Dict]:
+        return [record for _, _, record in sorted(self._heap, reverse=True)]
+
+
+def print_summary(top: TopK, counts: Dict[str, int], elapsed: float, stream):
+    print(f"\n{counts['processed']} resumes scored in {elapsed:.1f}s "
+          f"({counts['processed'] / elapsed if elapsed > 0 else 0:.1f}/s), "
+          f"{counts['skipped']} already done, {counts['duplicates']} near-duplicates not rescored, "
+          f"{counts['failed']} failed", file=stream)
+    best = top.best()
+    if not best:
+        return
+    print(f"\nTop {len(best)} candidates:", file=stream)
+    print(f"{'#':>4}  {'Score':>6}  {'Skills':>6}  {'Exp':>5}  {'Name':<28} File", file=stream)
+    for rank, record in enumerate(best, 1):
+        print(f"{rank:>4}  {record['match_score']:6.1f}  {record['skills_match']:6.1f}  "
+              f"{record['experience']:5.1f}  {record['name'][:28]:<28} {record['file']}", file=stream)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Parse and score resumes in bulk, writing JSON lines')
+    parser.add_argument('job_description', help='Text file with the job description')
+    parser.add_argument('resumes', nargs='+', help='Resume directories or glob patterns')
+    parser.add_argument('--output', default='results.jsonl',
+                        help="JSON lines output, also used to resume (default results.jsonl; '-' for stdout)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help=f'Worker processes (default {Config.PARSE_WORKERS}; 0 parses in this process '
+                             'with no timeout)')
+    parser.add_argument('--timeout', type=float, default=None,
+                        help=f'Seconds allowed per resume (default {Config.PARSE_TIMEOUT_SECONDS})')
+    parser.add_argument('--top-k', type=int, default=Config.TOP_CANDIDATES_DISPLAY,
+                        help='Candidates listed in the final summary')
+    parser.add_argument('--restart', action='store_true', help='Ignore and overwrite an existing output file')
+    parser.add_argument('--no-cache', action='store_true', help='Do not read or fill the parse cache')
+    parser.add_argument('--include-text', action='store_true', help='Include extracted resume text in each line')
+    parser.add_argument('--dedup-threshold', type=float, default=Config.DEDUP_THRESHOLD,
+                        help='Similarity at which a resume counts as a near-duplicate of an earlier one in this run '
+                             f'(default {Config.DEDUP_THRESHOLD})')
+    parser.add_argument('--no-dedup', action='store_true', help='Score every resume, near-duplicates included')
+    args = parser.parse_args(argv)
+
+    with open(args.job_description, 'r', encoding='utf-8') as f:
+        job_description = f.read()
+
+    paths = find_resumes(args.resumes)
+    to_stdout = args.output == '-'
+    log = sys.stderr if to_stdout else sys.stdout
+
+    top = TopK(args.top_k)
+    done: Set[str] = set()
+    if not to_stdout and not args.restart:
+        for record in load_checkpoint(args.output):
+            done.add(record['file'])
+            top.add(record)
+    remaining = [path for path in paths if path not in done]
+    counts = {'processed': 0, 'skipped': len(paths) - len(remaining), 'duplicates': 0, 'failed': 0}
+    print(f"{len(paths)} resumes found, {counts['skipped']} already in {args.output}, "
+          f"{len(remaining)} to process", file=log)
+
+    cache = None if args.no_cache else ParseCache(parser_version=ResumeParser.version())
+    output = sys.stdout if to_stdout else open(args.output, 'w' if args.restart else 'a', encoding='utf-8')
+    start = time.perf_counter()
+    last_report = start
+    try:
+        for result in process_resumes(read_files(remaining), job_description, workers=args.workers,
+                                      timeout=args.timeout, cache=cache,
+                                      dedup_threshold=None if args.no_dedup else args.dedup_threshold):
+            record = to_record(result, args.include_text)
+            # One complete line per resume, flushed so an interruption loses at most the line in flight
+            output.write(json.dumps(record) + '\n')
+            output.flush()
+
+            counts['processed'] += 1
+            counts['failed'] += 'error' in record
+            counts['duplicates'] += 'duplicate_of' in record
+            top.add(record)
+
+            now = time.perf_counter()
+            if now - last_report > 5:
+                print(f"  {counts['processed']} / {len(remaining)} "
+                      f"({counts['processed'] / (now - start):.1f}/s)", file=sys.stderr)
+                last_report = now
+    except KeyboardInterrupt:
+        print(f"\nInterrupted after {counts['processed']} resumes; run the same command again to continue.",
+              file=sys.stderr)
+        return 130
+    finally:
+        if not to_stdout:
+            output.close()
+        if cache is not None:
+            cache.close()
+
+    print_summary(top, counts, time.perf_counter() - start, log)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""Run the benchmark suite and write results as JSON.
+
+    python -m benchmarks                         # micro + end-to-end at 100, 1k, 10k
+    python -m benchmarks --suite micro
+    python -m benchmarks --sizes 100 1000 --output results.json --compare baseline.json
+
+With --compare, the exit status is 1 if anything regressed by more than --threshold.
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+
+from benchmarks import compare, end_to_end, micro
+from benchmarks.harness import environment
+from utils.config import Config
+from utils.resume_parser import ResumeParser
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Resume parsing and matching benchmarks')
+    parser.add_argument('--suite', choices=['micro', 'e2e', 'all'], default='all')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000],
+                        help='Corpus sizes for the end-to-end suite')
+    parser.add_argument('--workers', type=int, default=None,
+                        help=f'Worker processes for the pooled path (default {Config.PARSE_WORKERS})')
+    parser.add_argument('--repeat', type=int, default=5, help='Repeats per micro-benchmark')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--words', type=int, default=400, help='Words per synthetic resume')
+    parser.add_argument('--skill-density', type=float, default=0.05,
+                        help='Share of resume words that are skill mentions')
+    parser.add_argument('--output', help='Results file (default benchmarks/results/<timestamp>.json)')
+    parser.add_argument('--compare', metavar='BASELINE', help='Earlier results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    results = {
+        'environment': environment(),
+        'parameters': {
+            'suite': args.suite,
+            'seed': args.seed,
+            'words': args.words,
+            'skill_density': args.skill_density,
+            'parser_version': ResumeParser.version(),
+            'workers': Config.PARSE_WORKERS if args.workers is None else args.workers
+        }
+    }
+
+    if args.suite in ('micro', 'all'):
+        print('Micro-benchmarks (best time per call)')
+        results['micro'] = micro.run(repeat=args.repeat, seed=args.seed, words=args.words,
+                                     skill_density=args.skill_density)
+
+    if args.suite in ('e2e', 'all'):
+        print('End-to-end throughput')
+        results['parameters']['sizes'] = args.sizes
+        results['end_to_end'] = end_to_end.run(sizes=args.sizes, seed=args.seed, workers=args.workers,
+                                               words=args.words, skill_density=args.skill_density)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f'Results written to {output}')
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        return compare.report(compare.compare(baseline, results, args.threshold), args.threshold)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
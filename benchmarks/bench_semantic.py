@@ -0,0 +1,87 @@
+"""Compare semantic scoring latency: batched TF-IDF vs stored embeddings.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_semantic --sizes 1000 10000 100000
+
+Encoding is timed separately on a sample; without a local model the store
+holds random unit vectors, which cost the same to query.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+
+import numpy as np
+
+from benchmarks.corpus import generate_texts, job_description
+from benchmarks.harness import measure
+from utils.config import Config
+from utils.embeddings import EmbeddingEncoder, EmbeddingStore
+from utils.matcher import CandidateMatcher
+
+DEFAULT_DIM = 384  # all-MiniLM-L6-v2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--top-k', type=int, default=50)
+    parser.add_argument('--encode-sample', type=int, default=256)
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    matcher = CandidateMatcher(semantic_mode='tfidf')
+    jd = job_description(random.Random(42))
+
+    encoder = EmbeddingEncoder()
+    has_model = os.path.isdir(encoder.model_path)
+    dim = encoder.dim if has_model else DEFAULT_DIM
+
+    encode_per_resume = None
+    if has_model:
+        sample = generate_texts(args.encode_sample, seed=7)
+        encode_per_resume = measure(lambda: encoder.encode(sample), repeat=1, number=1)['min_seconds'] / len(sample)
+
+    rng = np.random.default_rng(0)
+    results = []
+    for size in args.sizes:
+        texts = generate_texts(size)
+        tfidf_seconds = measure(lambda: matcher._calculate_tfidf_matches(texts, jd), repeat=1, number=1)['min_seconds']
+
+        with tempfile.TemporaryDirectory() as directory:
+            store = EmbeddingStore(directory, dim, initial_capacity=size)
+            vectors = rng.standard_normal((size, dim)).astype(np.float32)
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+            store.add([f'resume-{i}' for i in range(size)], vectors)
+
+            query = encoder.encode([jd])[0] if has_model else vectors[0]
+            embedding_seconds = measure(lambda: store.top_k(query, args.top_k), repeat=3, number=1)['min_seconds']
+            del store
+
+        row = {
+            'resumes': size,
+            'tfidf_seconds': tfidf_seconds,
+            'embedding_query_seconds': embedding_seconds,
+            'speedup': tfidf_seconds / embedding_seconds if embedding_seconds > 0 else None,
+            'embedding_encode_seconds_once': encode_per_resume * size if encode_per_resume else None
+        }
+        results.append(row)
+        print(f"{size:>7} resumes  tfidf {tfidf_seconds * 1000:9.1f} ms  "
+              f"embedding {embedding_seconds * 1000:8.2f} ms  "
+              f"({row['speedup']:.0f}x)")
+
+    if encode_per_resume:
+        print(f"Encoding cost (paid once per resume): {encode_per_resume * 1000:.1f} ms/resume "
+              f"with batch size {Config.EMBEDDING_BATCH_SIZE}")
+    else:
+        print(f"No model at {encoder.model_path}; embedding timings use random {dim}-d vectors")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'model': encoder.name if has_model else None, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Compare two benchmark result files and flag regressions.
+
+    python -m benchmarks.compare baseline.json current.json --threshold 0.2
+
+Exits with status 1 if any timing got slower by more than the threshold.
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List, Tuple
+
+
+def timings(results: Dict) -> Dict[str, float]:
+    """Flatten a results file into {metric name: seconds}"""
+    flat = {}
+    for name, measurement in results.get('micro', {}).items():
+        flat[f'micro/{name}'] = measurement['min_seconds']
+    for row in results.get('end_to_end', []):
+        for stage, measurement in row.items():
+            if isinstance(measurement, dict) and 'seconds' in measurement:
+                flat[f"end_to_end/{row['resumes']}/{stage}"] = measurement['seconds']
+    return flat
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = 0.2) -> List[Tuple[str, float, float, float]]:
+    """(metric, baseline seconds, current seconds, ratio) for metrics in both runs"""
+    before = timings(baseline)
+    after = timings(current)
+    rows = []
+    for name in sorted(before.keys() & after.keys()):
+        ratio = after[name] / before[name] if before[name] > 0 else float('inf')
+        rows.append((name, before[name], after[name], ratio))
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Compare two benchmark result files')
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Relative slowdown that counts as a regression (default 0.2 = 20%%)')
+    args = parser.parse_args(argv)
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(args.current, 'r', encoding='utf-8') as f:
+        current = json.load(f)
+
+    return report(compare(baseline, current, args.threshold), args.threshold)
+
+
+def report(rows: List[Tuple[str, float, float, float]], threshold: float) -> int:
+    regressions = 0
+    for name, before, after, ratio in rows:
+        marker = ''
+        if ratio > 1 + threshold:
+            marker = '  REGRESSION'
+            regressions += 1
+        elif ratio < 1 / (1 + threshold):
+            marker = '  faster'
+        print(f"{name:<60} {before * 1e3:10.3f} ms -> {after * 1e3:10.3f} ms  x{ratio:5.2f}{marker}")
+
+    print(f"{regressions} regression(s) over {threshold:.0%} in {len(rows)} metrics")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
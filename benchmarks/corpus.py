@@ -0,0 +1,160 @@
+"""Deterministic synthetic resumes and job descriptions for benchmarks.
+
+The same seed always produces byte-identical files.
+"""
+import datetime
+import io
+import random
+import zipfile
+from typing import List, Tuple
+
+from utils.skill_engine import get_skill_engine
+
+FIRST_NAMES = ['James', 'Maria', 'Wei', 'Aisha', 'Carlos', 'Priya', 'John', 'Fatima', 'Lukas', 'Yuki']
+LAST_NAMES = ['Smith', 'Garcia', 'Chen', 'Khan', 'Silva', 'Patel', 'Brown', 'Ali', 'Weber', 'Tanaka']
+DEGREES = [
+    'Bachelor of Science in Computer Science, State University',
+    'Master of Science in Data Science, Tech Institute',
+    'BA in Economics, City College',
+    'PhD in Statistics, National University'
+]
+
+# Filler vocabulary: common resume prose without any taxonomy skills
+WORDS = (
+    'team lead senior engineer developer built designed deployed services platform data '
+    'pipeline cloud scalable production customers improved reduced latency performance '
+    'architecture mentoring project delivery analytics dashboard reporting stakeholders '
+    'requirements migrated automated testing monitoring reliability ownership roadmap '
+    'collaborated cross functional launched features users growth revenue cost efficiency'
+).split()
+
+FORMATS = ('txt', 'docx', 'pdf')
+
+# python-docx stamps documents and zip entries with the current time; these replace it
+FIXED_TIME = datetime.datetime(2024, 1, 1)
+
+
+def resume_text(rng: random.Random, words: int = 400, skill_density: float = 0.05,
+                experience_years: int = None) -> str:
+    """Plain-text resume of about `words` words where roughly `skill_density` of
+    the words are skill mentions (canonical names or aliases)"""
+    engine = get_skill_engine()
+    terms = list(engine.aliases)
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    years = experience_years if experience_years is not None else rng.randint(0, 15)
+
+    lines = [
+        name,
+        f"Email: {name.lower().replace(' ', '.')}@example.com",
+        f"Phone: +1 {rng.randint(200, 999)}-{rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+        '',
+        'Summary',
+        f"Engineer with {years} years of experience.",
+        '',
+        'Experience'
+    ]
+
+    body = []
+    for _ in range(words):
+        body.append(rng.choice(terms) if rng.random() < skill_density else rng.choice(WORDS))
+    # Twelve words per line, roughly like a formatted resume
+    lines.extend(' '.join(body[i:i + 12]) for i in range(0, len(body), 12))
+
+    lines.extend(['', 'Education', rng.choice(DEGREES)])
+    return '\n'.join(lines)
+
+
+def job_description(rng: random.Random, skills: int = 8, words: int = 150, required_years: int = 5) -> str:
+    """Job description naming `skills` taxonomy skills and a years requirement"""
+    engine = get_skill_engine()
+    required = rng.sample(engine.skills, min(skills, len(engine.skills)))
+    filler = ' '.join(rng.choice(WORDS) for _ in range(words))
+    return (
+        f"We are hiring a senior engineer. Requirements: {required_years}+ years of experience "
+        f"with {', '.join(required)}. {filler}"
+    )
+
+
+def to_txt(text: str) -> bytes:
+    return text.encode('utf-8')
+
+
+def to_docx(text: str) -> bytes:
+    from docx import Document
+
+    document = Document()
+    for line in text.split('\n'):
+        document.add_paragraph(line)
+    document.core_properties.created = FIXED_TIME
+    document.core_properties.modified = FIXED_TIME
+    document.core_properties.revision = 1
+    buffer = io.BytesIO()
+    document.save(buffer)
+
+    pinned = io.BytesIO()
+    with zipfile.ZipFile(buffer) as source, zipfile.ZipFile(pinned, 'w', zipfile.ZIP_DEFLATED) as target:
+        for entry in source.infolist():
+            info = zipfile.ZipInfo(entry.filename, date_time=FIXED_TIME.timetuple()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            target.writestr(info, source.read(entry.filename))
+    return pinned.getvalue()
+
+
+def to_pdf(text: str, lines_per_page: int = 50) -> bytes:
+    """Minimal hand-written single-font PDF with one text line per resume line"""
+    lines = text.split('\n')
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    def escape(line: str) -> str:
+        return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        ('<< /Type /Pages /Kids [%s] /Count %d >>' % (
+            ' '.join(f'{4 + 2 * i} 0 R' for i in range(len(pages))), len(pages))).encode(),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>'
+    ]
+    for i, page in enumerate(pages):
+        content = ('BT /F1 10 Tf 40 760 Td 14 TL ' +
+                   ' '.join(f"({escape(line)}) '" for line in page) + ' ET').encode('latin-1', 'replace')
+        objects.append((
+            '<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            f'/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>'
+        ).encode())
+        objects.append(b'<< /Length %d >>\nstream\n' % len(content) + content + b'\nendstream')
+
+    pdf = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+
+    xref = len(pdf)
+    pdf += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        pdf += b'%010d 00000 n \n' % offset
+    pdf += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return bytes(pdf)
+
+
+CONVERTERS = {'txt': to_txt, 'docx': to_docx, 'pdf': to_pdf}
+
+
+def generate_corpus(count: int, seed: int = 0, formats: Tuple[str, ...] = FORMATS,
+                    words: int = 400, skill_density: float = 0.05) -> List[Tuple[str, bytes]]:
+    """(filename, content) pairs cycling through the given formats"""
+    corpus = []
+    for i in range(count):
+        rng = random.Random(seed * 1_000_003 + i)
+        file_format = formats[i % len(formats)]
+        text = resume_text(rng, words=words, skill_density=skill_density)
+        corpus.append((f'resume_{i:06d}.{file_format}', CONVERTERS[file_format](text)))
+    return corpus
+
+
+def generate_texts(count: int, seed: int = 0, words: int = 400, skill_density: float = 0.05) -> List[str]:
+    """Plain resume texts, for benchmarks that skip file decoding"""
+    return [
+        resume_text(random.Random(seed * 1_000_003 + i), words=words, skill_density=skill_density)
+        for i in range(count)
+    ]
@@ -0,0 +1,55 @@
+"""End-to-end throughput: parse and score synthetic corpora of increasing size."""
+import random
+import time
+from typing import Dict, List, Optional, Sequence
+
+from benchmarks.corpus import FORMATS, generate_corpus, job_description
+from utils.batch_processor import process_resumes
+from utils.matcher import CandidateMatcher
+from utils.resume_parser import ResumeParser
+
+
+def _stage(seconds: float, count: int) -> Dict:
+    return {'seconds': seconds, 'resumes_per_second': count / seconds if seconds > 0 else None}
+
+
+def run(sizes: Sequence[int] = (100, 1000, 10000), seed: int = 0, workers: Optional[int] = None,
+        formats: Sequence[str] = FORMATS, words: int = 400, skill_density: float = 0.05,
+        verbose: bool = True) -> List[Dict]:
+    """For each size: serial parse, batched scoring, and the pooled parse+score path"""
+    parser = ResumeParser()
+    matcher = CandidateMatcher(semantic_mode='tfidf')
+    jd = job_description(random.Random(seed))
+
+    results = []
+    for size in sizes:
+        corpus = generate_corpus(size, seed=seed, formats=tuple(formats), words=words,
+                                 skill_density=skill_density)
+
+        start = time.perf_counter()
+        parsed = [parser.parse_resume_bytes(data, filename) for filename, data in corpus]
+        parse_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matcher.calculate_matches(parsed, jd)
+        score_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in process_resumes(corpus, jd, workers=workers):
+            pass
+        pooled_seconds = time.perf_counter() - start
+
+        row = {
+            'resumes': size,
+            'corpus_bytes': sum(len(data) for _, data in corpus),
+            'serial_parse': _stage(parse_seconds, size),
+            'batch_score': _stage(score_seconds, size),
+            'serial_total': _stage(parse_seconds + score_seconds, size),
+            'pooled_parse_and_score': _stage(pooled_seconds, size)
+        }
+        results.append(row)
+        if verbose:
+            print(f"  {size:>6} resumes  parse {parse_seconds:8.2f}s  score {score_seconds:7.2f}s  "
+                  f"pooled {pooled_seconds:8.2f}s  "
+                  f"({row['pooled_parse_and_score']['resumes_per_second']:.0f} resumes/s pooled)")
+    return results
@@ -0,0 +1,59 @@
+"""Timing helpers shared by the benchmark suites."""
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+
+def calibrate(func: Callable, min_seconds: float = 0.05, max_number: int = 100000) -> int:
+    """Number of calls that takes at least min_seconds, so fast functions are
+    not timed below the clock's resolution"""
+    number = 1
+    while number < max_number:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - start >= min_seconds:
+            break
+        number *= 2
+    return number
+
+
+def measure(func: Callable, repeat: int = 5, number: Optional[int] = None) -> Dict:
+    """Time `number` calls of func, `repeat` times, and summarize per call"""
+    if number is None:
+        number = calibrate(func)
+    per_call = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        per_call.append((time.perf_counter() - start) / number)
+
+    return {
+        'min_seconds': min(per_call),
+        'median_seconds': statistics.median(per_call),
+        'mean_seconds': statistics.fmean(per_call),
+        'repeat': repeat,
+        'number': number
+    }
+
+
+def environment() -> Dict:
+    """Where and on what code a benchmark ran, stored with its results"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'git_commit': commit
+    }
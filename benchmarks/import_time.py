@@ -0,0 +1,108 @@
+"""Cold-start import cost of the app's modules, with a budget check.
+
+Run from the repository root:
+
+    python -m benchmarks.import_time                  # report
+    python -m benchmarks.import_time --check          # also exit 1 if over budget
+
+--check fails if a module takes longer than Config.COLD_START_BUDGET_MS or
+imports a heavy dependency that should load on first use.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+from utils.config import Config
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules imported on startup by the app, the batch workers and the benchmarks
+MODULES = (
+    'utils.resume_parser', 'utils.matcher', 'utils.batch_processor', 'utils.pipeline',
+    'models.candidate_model', 'models.columnar_store'
+)
+
+# Loaded on first use only: per file format, for TF-IDF scoring, per chart or table, for embeddings
+LAZY_DEPENDENCIES = ('PyPDF2', 'docx', 'sklearn', 'scipy', 'plotly', 'pandas', 'sentence_transformers', 'torch')
+
+
+def import_profile(module: str) -> List[Dict]:
+    """Entries of `python -X importtime -c 'import module'`, in the order printed"""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        entries.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2,
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000
+        })
+    return entries
+
+
+def report(module: str, top: int = 8) -> Dict:
+    entries = import_profile(module)
+    # Top-level entries include interpreter startup (site, encodings), which is part of a cold start
+    top_level = [entry for entry in entries if entry['depth'] == 0]
+    direct = [entry for entry in entries if entry['depth'] == 1]
+    loaded = {entry['module'] for entry in entries}
+    return {
+        'module': module,
+        'total_ms': sum(entry['cumulative_ms'] for entry in top_level),
+        'slowest': sorted(direct, key=lambda entry: entry['cumulative_ms'], reverse=True)[:top],
+        'lazy_loaded_eagerly': sorted(
+            dependency for dependency in LAZY_DEPENDENCIES if dependency in loaded
+        )
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Cold-start import times')
+    parser.add_argument('modules', nargs='*', default=list(MODULES))
+    parser.add_argument('--check', action='store_true',
+                        help='Exit with status 1 if a module is over budget or loads a lazy dependency')
+    parser.add_argument('--budget-ms', type=float, default=Config.COLD_START_BUDGET_MS)
+    parser.add_argument('--top', type=int, default=8, help='Slowest dependencies shown per module')
+    parser.add_argument('--output', help='Write the report as JSON to this file')
+    args = parser.parse_args(argv)
+
+    results = []
+    failures = 0
+    for module in args.modules:
+        try:
+            result = report(module, args.top)
+        except RuntimeError as e:
+            print(f"{module}: could not be imported ({e})")
+            failures += 1
+            continue
+        results.append(result)
+
+        over = result['total_ms'] > args.budget_ms
+        failures += over + bool(result['lazy_loaded_eagerly'])
+        print(f"{module:<28} {result['total_ms']:8.1f} ms{'  OVER BUDGET' if over else ''}")
+        for entry in result['slowest']:
+            print(f"    {entry['module']:<40} {entry['cumulative_ms']:8.1f} ms")
+        if result['lazy_loaded_eagerly']:
+            print(f"    loaded at import: {', '.join(result['lazy_loaded_eagerly'])}")
+
+    print(f"Budget {args.budget_ms:.0f} ms per module; {failures} problem(s)")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'budget_ms': args.budget_ms, 'results': results}, f, indent=2)
+    return 1 if args.check and failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
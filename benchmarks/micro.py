@@ -0,0 +1,74 @@
+"""Micro-benchmarks for each ResumeParser extractor and CandidateMatcher component."""
+import io
+import random
+from typing import Callable, Dict
+
+from benchmarks.corpus import CONVERTERS, generate_texts, job_description, resume_text
+from benchmarks.harness import measure
+from utils.document import document_cache
+from utils.matcher import CandidateMatcher
+from utils.resume_parser import ResumeParser
+
+
+def _fresh(func: Callable) -> Callable:
+    """Wrap func to start from an empty document cache, so each timing includes tokenization"""
+    def case():
+        document_cache.clear()
+        return func()
+    return case
+
+
+def cases(seed: int = 0, words: int = 400, skill_density: float = 0.05) -> Dict[str, Callable]:
+    """Named zero-argument callables, each exercising one component on one resume"""
+    parser = ResumeParser()
+    matcher = CandidateMatcher(semantic_mode='tfidf')
+
+    rng = random.Random(seed)
+    text = resume_text(rng, words=words, skill_density=skill_density)
+    jd = job_description(rng)
+    requisitions = [job_description(rng) for _ in range(20)]
+    files = {file_format: convert(text) for file_format, convert in CONVERTERS.items()}
+    parsed = parser._parse_text(text)
+    batch = [parser._parse_text(other) for other in generate_texts(100, seed=seed + 1, words=words,
+                                                                   skill_density=skill_density)]
+
+    def parse_and_match():
+        matcher.calculate_match(parser._parse_text(text), jd)
+
+    timed_cases = {
+        'parser._extract_text[txt]': lambda: parser._extract_text(files['txt'], 'resume.txt'),
+        'parser._extract_text[docx]': lambda: parser._extract_text(files['docx'], 'resume.docx'),
+        'parser._extract_text[pdf]': lambda: parser._extract_text(files['pdf'], 'resume.pdf'),
+        'parser._extract_from_pdf': lambda: parser._extract_from_pdf(io.BytesIO(files['pdf'])),
+        'parser._extract_from_docx': lambda: parser._extract_from_docx(io.BytesIO(files['docx'])),
+        'parser._extract_name_simple': lambda: parser._extract_name_simple(text),
+        'parser._extract_email': lambda: parser._extract_email(text),
+        'parser._extract_phone': lambda: parser._extract_phone(text),
+        'parser._extract_skills': lambda: parser._extract_skills(text),
+        'parser._extract_experience': lambda: parser._extract_experience(text),
+        'parser._extract_education_simple': lambda: parser._extract_education_simple(text),
+        'parser._parse_text': lambda: parser._parse_text(text),
+        'matcher._extract_skills_from_jd': lambda: matcher._extract_skills_from_jd(jd),
+        'matcher._extract_required_experience': lambda: matcher._extract_required_experience(jd),
+        'matcher._calculate_skills_match': lambda: matcher._calculate_skills_match(parsed['skills'], jd),
+        'matcher._calculate_experience_match': lambda: matcher._calculate_experience_match(parsed['experience'], jd),
+        'matcher._calculate_semantic_match': lambda: matcher._calculate_semantic_match(text, jd),
+        'matcher.calculate_match': lambda: matcher.calculate_match(parsed, jd),
+        'matcher.calculate_matches[100]': lambda: matcher.calculate_matches(batch, jd),
+        'matcher.calculate_match_matrix[100x20]': lambda: matcher.calculate_match_matrix(batch, requisitions),
+        'parser._parse_text+matcher.calculate_match': parse_and_match
+    }
+    fresh_cases = {name: _fresh(func) for name, func in timed_cases.items()}
+    # Rescoring resumes whose documents are already tokenized, e.g. against a second job description
+    fresh_cases['matcher.calculate_matches[100,tokenized]'] = lambda: matcher.calculate_matches(batch, jd)
+    return fresh_cases
+
+
+def run(repeat: int = 5, seed: int = 0, words: int = 400, skill_density: float = 0.05,
+        verbose: bool = True) -> Dict[str, Dict]:
+    results = {}
+    for name, func in cases(seed, words, skill_density).items():
+        results[name] = measure(func, repeat=repeat)
+        if verbose:
+            print(f"  {name:<42} {results[name]['min_seconds'] * 1e6:10.1f} us")
+    return results
@@ -1,6 +1,14 @@
+import json
+import os
+import sqlite3
+import threading
+from collections import Counter
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional, Tuple
 from datetime import datetime
+from utils.config import Config
+from utils.dedup import DuplicateIndex, minhash_signature, signature_from_bytes
+from utils.skill_index import SkillIndex
 
 @dataclass
 class Candidate:
@@ -17,10 +25,49 @@ class Candidate:
     semantic_match: float = 0.0
     status: str = "New"
     applied_date: str = None
+    filename: str = ""
+    content_hash: str = ""
+    minhash: bytes = b""
+    id: Optional[int] = None
     
     def __post_init__(self):
         if self.applied_date is None:
             self.applied_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    
+    @classmethod
+    def from_match_result(cls, result: Dict) -> 'Candidate':
+        """Build a candidate from a CandidateMatcher result dict"""
+        return cls(
+            name=result['name'],
+            email=result['email'],
+            phone=result['phone'],
+            skills=list(result['skills']),
+            experience=result['experience'],
+            education=result['education'],
+            resume_text=result['raw_text'],
+            match_score=result.get('match_score', 0.0),
+            skills_match=result.get('skills_match', 0.0),
+            experience_match=result.get('experience_match', 0.0),
+            semantic_match=result.get('semantic_match', 0.0),
+            filename=result.get('filename', ''),
+            content_hash=result.get('content_hash', ''),
+            minhash=result.get('minhash', b'')
+        )
+    
+    def to_parsed_dict(self) -> Dict:
+        """The candidate as a ResumeParser-style dict, ready for CandidateMatcher"""
+        return {
+            'name': self.name,
+            'email': self.email,
+            'phone': self.phone,
+            'skills': self.skills,
+            'experience': self.experience,
+            'education': self.education,
+            'raw_text': self.resume_text,
+            'content_hash': self.content_hash,
+            'filename': self.filename,
+            'candidate_id': self.id
+        }
 
 @dataclass
 class JobDescription:
@@ -31,15 +78,325 @@ class JobDescription:
     company: str
     location: str
 
+# Columns stored for each candidate, in Candidate field order
+CANDIDATE_COLUMNS = (
+    'name', 'email', 'phone', 'skills', 'experience', 'education', 'resume_text',
+    'match_score', 'skills_match', 'experience_match', 'semantic_match', 'status',
+    'applied_date', 'filename', 'content_hash', 'minhash'
+)
+
+# Review stages a candidate moves through; new candidates start in the first
+CANDIDATE_STATUSES = ('New', 'Shortlisted', 'Rejected')
+
+# Columns that can be used to order query results; each one is indexed
+SORTABLE_COLUMNS = ('match_score', 'experience', 'status', 'applied_date')
+
+# The dashboard's score histogram has this many equal-width buckets over 0-100
+SCORE_BUCKETS = 10
+
 class CandidatePool:
-    def __init__(self):
-        self.candidates = []
+    """SQLite-backed candidate store with indexed top-k and range queries; in memory unless given a file path"""
+    
+    def __init__(self, db_path: str = ':memory:'):
+        self.db_path = db_path
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._skill_index = None
+        self._duplicate_indexes: Dict[float, DuplicateIndex] = {}
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS candidates (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    email TEXT,
+                    phone TEXT,
+                    skills TEXT NOT NULL,
+                    experience REAL NOT NULL,
+                    education TEXT,
+                    resume_text TEXT,
+                    match_score REAL NOT NULL,
+                    skills_match REAL NOT NULL,
+                    experience_match REAL NOT NULL,
+                    semantic_match REAL NOT NULL,
+                    status TEXT NOT NULL,
+                    applied_date TEXT NOT NULL,
+                    filename TEXT,
+                    content_hash TEXT,
+                    minhash BLOB
+                )
+            """)
+            # Pools created before near-duplicate detection lack the signature column
+            columns = {row[1] for row in self._conn.execute('PRAGMA table_info(candidates)')}
+            if 'minhash' not in columns:
+                self._conn.execute('ALTER TABLE candidates ADD COLUMN minhash BLOB')
+            for column in SORTABLE_COLUMNS:
+                self._conn.execute(
+                    f'CREATE INDEX IF NOT EXISTS idx_candidates_{column} ON candidates ({column})'
+                )
+            # Status pages are usually browsed best-first
+            self._conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_candidates_status_score ON candidates (status, match_score)'
+            )
+            # Running totals for the dashboard, updated in the same transaction as each write
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS pool_aggregates (
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value REAL NOT NULL,
+                    PRIMARY KEY (kind, key)
+                )
+            """)
+        
+        rows = self._conn.execute('SELECT kind, key, value FROM pool_aggregates')
+        self._aggregates = Counter({(kind, key): value for kind, key, value in rows})
+        if not self._aggregates and self._conn.execute('SELECT EXISTS (SELECT 1 FROM candidates)').fetchone()[0]:
+            # A pool created before aggregates were kept
+            self.rebuild_aggregates()
+    
+    def add_candidate(self, candidate: Candidate) -> int:
+        """Store a candidate and return its id"""
+        return self.add_candidates([candidate])[0]
+    
+    def add_candidates(self, candidates: List[Candidate]) -> List[int]:
+        """Store several candidates in one transaction and return their ids"""
+        placeholders = ', '.join('?' for _ in CANDIDATE_COLUMNS)
+        sql = f'INSERT INTO candidates ({", ".join(CANDIDATE_COLUMNS)}) VALUES ({placeholders})'
+        
+        ids = []
+        deltas = Counter()
+        with self._lock, self._conn:
+            for candidate in candidates:
+                cursor = self._conn.execute(sql, self._to_row(candidate))
+                candidate.id = cursor.lastrowid
+                ids.append(candidate.id)
+                deltas.update(self._candidate_aggregates(candidate.match_score, candidate.status, candidate.skills))
+                if self._skill_index is not None:
+                    self._skill_index.add(candidate.id, candidate.skills)
+                if self._duplicate_indexes:
+                    signature = self._signature(candidate.minhash, candidate.resume_text)
+                    for index in self._duplicate_indexes.values():
+                        index.add(candidate.id, signature)
+            self._apply_aggregates(deltas)
+        return ids
+    
+    @property
+    def skill_index(self) -> SkillIndex:
+        """Inverted skill index over the pool, built on first use and kept up to date"""
+        with self._lock:
+            if self._skill_index is None:
+                index = SkillIndex()
+                for candidate_id, skills in self._conn.execute('SELECT id, skills FROM candidates'):
+                    index.add(candidate_id, json.loads(skills))
+                self._skill_index = index
+        return self._skill_index
+    
+    def duplicate_index(self, threshold: Optional[float] = None) -> DuplicateIndex:
+        """Near-duplicate index banded for a threshold, built on first use and kept up to date"""
+        threshold = Config.DEDUP_THRESHOLD if threshold is None else threshold
+        with self._lock:
+            index = self._duplicate_indexes.get(threshold)
+            if index is None:
+                index = DuplicateIndex(threshold)
+                if self._duplicate_indexes:
+                    # Signatures are the same whatever the banding, so reuse those already loaded
+                    signatures = next(iter(self._duplicate_indexes.values())).signatures.items()
+                else:
+                    signatures = ((candidate_id, self._signature(minhash, resume_text))
+                                  for candidate_id, minhash, resume_text in self._conn.execute(
+                                      'SELECT id, minhash, resume_text FROM candidates'))
+                for candidate_id, signature in list(signatures):
+                    index.add(candidate_id, signature)
+                self._duplicate_indexes[threshold] = index
+        return index
+    
+    def find_duplicate(self, candidate: Candidate, threshold: Optional[float] = None) -> Optional[int]:
+        """Id of a stored candidate whose resume is a near-duplicate of this one's, if any"""
+        signature = self._signature(candidate.minhash, candidate.resume_text)
+        found = self.duplicate_index(threshold).find(signature)
+        return found[0] if found is not None else None
+    
+    @staticmethod
+    def _signature(minhash: Optional[bytes], resume_text: Optional[str]):
+        # Candidates stored before signatures were kept get one computed from their text
+        return signature_from_bytes(minhash) if minhash else minhash_signature(resume_text or '')
+    
+    def shortlist(self, job_skills: List[str], query: Optional[str] = None,
+                  top_k: int = 50) -> List[Tuple[Candidate, float]]:
+        """Candidates covering the most of a job's skills, with their coverage (0-1), served from the skill index"""
+        ranked = self.skill_index.rank(job_skills, query=query, top_k=top_k)
+        candidates = {candidate.id: candidate for candidate in self.get_candidates([cid for cid, _ in ranked])}
+        return [(candidates[cid], score) for cid, score in ranked if cid in candidates]
+    
+    def get_candidates(self, candidate_ids: List[int]) -> List[Candidate]:
+        if not candidate_ids:
+            return []
+        placeholders = ', '.join('?' for _ in candidate_ids)
+        return self._select(f'WHERE id IN ({placeholders})', list(candidate_ids))
     
-    def add_candidate(self, candidate: Candidate):
-        self.candidates.append(candidate)
+    def get_candidate(self, candidate_id: int) -> Optional[Candidate]:
+        rows = self._select('WHERE id = ?', [candidate_id])
+        return rows[0] if rows else None
+    
+    def update_status(self, candidate_id: int, status: str):
+        with self._lock, self._conn:
+            row = self._conn.execute('SELECT status FROM candidates WHERE id = ?', (candidate_id,)).fetchone()
+            if row is None:
+                return
+            self._conn.execute('UPDATE candidates SET status = ? WHERE id = ?', (status, candidate_id))
+            deltas = Counter()
+            deltas[('status', row[0])] -= 1
+            deltas[('status', status)] += 1
+            self._apply_aggregates(deltas)
+    
+    def update_scores(self, results: Iterable[Dict]):
+        """Store new scores from CandidateMatcher results that carry a 'candidate_id'"""
+        deltas = Counter()
+        with self._lock, self._conn:
+            for result in results:
+                candidate_id = result.get('candidate_id')
+                if candidate_id is None:
+                    continue
+                row = self._conn.execute('SELECT match_score FROM candidates WHERE id = ?', (candidate_id,)).fetchone()
+                if row is None:
+                    continue
+                self._conn.execute(
+                    'UPDATE candidates SET match_score = ?, skills_match = ?, experience_match = ?, '
+                    'semantic_match = ? WHERE id = ?',
+                    (result['match_score'], result['skills_match'], result['experience_match'],
+                     result['semantic_match'], candidate_id)
+                )
+                deltas[('sum', 'match_score')] += result['match_score'] - row[0]
+                deltas[('score_bucket', self._score_bucket(row[0]))] -= 1
+                deltas[('score_bucket', self._score_bucket(result['match_score']))] += 1
+            self._apply_aggregates(deltas)
+    
+    def stats(self, top_skills: int = 10) -> Dict:
+        """Dashboard statistics, read from the running aggregates without touching the candidates"""
+        with self._lock:
+            aggregates = dict(self._aggregates)
+        total = int(aggregates.get(('count', 'candidates'), 0))
+        skills = Counter({key: int(value) for (kind, key), value in aggregates.items()
+                          if kind == 'skill' and value > 0})
+        return {
+            'total': total,
+            'average_score': aggregates.get(('sum', 'match_score'), 0.0) / total if total else 0.0,
+            'status_counts': {key: int(value) for (kind, key), value in aggregates.items()
+                              if kind == 'status' and value > 0},
+            'top_skills': skills.most_common(top_skills),
+            'score_histogram': [int(aggregates.get(('score_bucket', str(bucket)), 0))
+                                for bucket in range(SCORE_BUCKETS)]
+        }
+    
+    def rebuild_aggregates(self):
+        """Recompute the running aggregates from every stored candidate"""
+        deltas = Counter()
+        with self._lock, self._conn:
+            for score, status, skills in self._conn.execute('SELECT match_score, status, skills FROM candidates'):
+                deltas.update(self._candidate_aggregates(score, status, json.loads(skills)))
+            self._conn.execute('DELETE FROM pool_aggregates')
+            self._aggregates.clear()
+            self._apply_aggregates(deltas)
+    
+    @staticmethod
+    def _score_bucket(score: float) -> str:
+        return str(min(max(int(score * SCORE_BUCKETS // 100), 0), SCORE_BUCKETS - 1))
+    
+    def _candidate_aggregates(self, score: float, status: str, skills: List[str]) -> Counter:
+        """One candidate's contribution to the running aggregates"""
+        deltas = Counter({
+            ('count', 'candidates'): 1,
+            ('sum', 'match_score'): score,
+            ('status', status): 1,
+            ('score_bucket', self._score_bucket(score)): 1
+        })
+        deltas.update(('skill', skill) for skill in set(skills))
+        return deltas
+    
+    def _apply_aggregates(self, deltas: Counter):
+        # Called with the lock held, inside the transaction making the change
+        deltas = {key: value for key, value in deltas.items() if value}
+        self._conn.executemany(
+            'INSERT INTO pool_aggregates (kind, key, value) VALUES (?, ?, ?) '
+            'ON CONFLICT (kind, key) DO UPDATE SET value = value + excluded.value',
+            [(kind, key, value) for (kind, key), value in deltas.items()]
+        )
+        for key, value in deltas.items():
+            self._aggregates[key] += value
     
     def get_top_candidates(self, top_n: int = 10) -> List[Candidate]:
-        return sorted(self.candidates, key=lambda x: x.match_score, reverse=True)[:top_n]
+        # Walks the match_score index backwards and stops after top_n rows
+        return self._select('ORDER BY match_score DESC LIMIT ?', [top_n])
     
     def filter_by_score(self, min_score: float) -> List[Candidate]:
-        return [candidate for candidate in self.candidates if candidate.match_score >= min_score]
\ No newline at end of file
+        return self._select('WHERE match_score >= ? ORDER BY match_score DESC', [min_score])
+    
+    def query(self, min_score: Optional[float] = None, max_score: Optional[float] = None,
+              min_experience: Optional[float] = None, max_experience: Optional[float] = None,
+              status: Optional[str] = None, applied_from: Optional[str] = None,
+              applied_to: Optional[str] = None, order_by: str = 'match_score',
+              descending: bool = True, page: int = 1, page_size: int = 50) -> List[Candidate]:
+        """Return one page of candidates matching the given ranges, ordered by an indexed column"""
+        if order_by not in SORTABLE_COLUMNS:
+            raise ValueError(f"Cannot order by {order_by!r}; choose one of {', '.join(SORTABLE_COLUMNS)}")
+        
+        where, params = self._where(min_score, max_score, min_experience, max_experience,
+                                    status, applied_from, applied_to)
+        direction = 'DESC' if descending else 'ASC'
+        clause = f'{where} ORDER BY {order_by} {direction}, id {direction} LIMIT ? OFFSET ?'
+        return self._select(clause, params + [page_size, (max(page, 1) - 1) * page_size])
+    
+    def count(self, min_score: Optional[float] = None, max_score: Optional[float] = None,
+              min_experience: Optional[float] = None, max_experience: Optional[float] = None,
+              status: Optional[str] = None, applied_from: Optional[str] = None,
+              applied_to: Optional[str] = None) -> int:
+        """Number of candidates matching the same filters as query"""
+        where, params = self._where(min_score, max_score, min_experience, max_experience,
+                                    status, applied_from, applied_to)
+        with self._lock:
+            return self._conn.execute(f'SELECT COUNT(*) FROM candidates {where}', params).fetchone()[0]
+    
+    def __len__(self) -> int:
+        return self.count()
+    
+    def _where(self, min_score, max_score, min_experience, max_experience,
+               status, applied_from, applied_to):
+        conditions = []
+        params = []
+        for column, operator, value in [
+            ('match_score', '>=', min_score),
+            ('match_score', '<=', max_score),
+            ('experience', '>=', min_experience),
+            ('experience', '<=', max_experience),
+            ('status', '=', status),
+            ('applied_date', '>=', applied_from),
+            ('applied_date', '<=', applied_to)
+        ]:
+            if value is not None:
+                conditions.append(f'{column} {operator} ?')
+                params.append(value)
+        
+        where = 'WHERE ' + ' AND '.join(conditions) if conditions else ''
+        return where, params
+    
+    def _select(self, clause: str, params: List) -> List[Candidate]:
+        sql = f'SELECT {", ".join(CANDIDATE_COLUMNS)}, id FROM candidates {clause}'
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._from_row(row) for row in rows]
+    
+    def _to_row(self, candidate: Candidate) -> tuple:
+        row = [getattr(candidate, column) for column in CANDIDATE_COLUMNS]
+        row[CANDIDATE_COLUMNS.index('skills')] = json.dumps(candidate.skills)
+        return tuple(row)
+    
+    def _from_row(self, row: tuple) -> Candidate:
+        values = dict(zip(CANDIDATE_COLUMNS + ('id',), row))
+        values['skills'] = json.loads(values['skills'])
+        values['minhash'] = values['minhash'] or b''
+        return Candidate(**values)
+    
+    def close(self):
+        self._conn.close()
\ No newline at end of file
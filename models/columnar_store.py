@@ -0,0 +1,326 @@
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from utils.matcher import weighted_score
+from utils.skill_engine import SkillEngine, get_skill_engine
+
+# Number of set bits in every byte value, for popcounts over packed bitsets
+_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+# Score and experience columns, stored as float32
+NUMERIC_COLUMNS = ('match_score', 'skills_match', 'experience_match', 'semantic_match', 'keywords_match',
+                   'experience')
+
+# Text columns stored as codes into the shared string table
+STRING_COLUMNS = ('name', 'email', 'phone', 'education', 'filename', 'content_hash', 'status', 'duplicate_of')
+
+# Text columns matched by filter(search=...)
+SEARCH_COLUMNS = ('name', 'email', 'filename')
+
+
+def _popcount(bits: np.ndarray) -> np.ndarray:
+    """Set bits per row of a (rows, words) uint64 array"""
+    if bits.shape[1] == 0:
+        return np.zeros(bits.shape[0], dtype=np.int64)
+    return _POPCOUNT[bits.view(np.uint8)].reshape(bits.shape[0], -1).sum(axis=1, dtype=np.int64)
+
+
+class StringTable:
+    """Interns strings so repeated values (statuses, education lines) are stored once"""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def code(self, value: str) -> int:
+        """Code of a string, or -1 if it was never interned"""
+        return self.codes.get(value, -1)
+
+    def __getitem__(self, code: int) -> str:
+        return self.values[code]
+
+
+class ColumnarCandidateStore:
+    """Match results held column by column, so filters and sorts run as array operations over every row"""
+
+    def __init__(self, skill_engine: Optional[SkillEngine] = None, initial_capacity: int = 1024):
+        self.skill_engine = skill_engine or get_skill_engine()
+        self.skill_bits: Dict[str, int] = {}
+        for skill in self.skill_engine.skills:
+            self.skill_bits.setdefault(skill, len(self.skill_bits))
+
+        self.strings = StringTable()
+        self._size = 0
+        self._capacity = max(1, initial_capacity)
+        self._numeric = {column: np.zeros(self._capacity, dtype=np.float32) for column in NUMERIC_COLUMNS}
+        self._codes = {column: np.zeros(self._capacity, dtype=np.int32) for column in STRING_COLUMNS}
+        self._failed = np.zeros(self._capacity, dtype=bool)
+        self._bits = np.zeros((self._capacity, self._words(len(self.skill_bits))), dtype=np.uint64)
+        self.skill_names = list(self.skill_bits)
+        # Skills of row i in parsed order: _skill_ids[_skill_offsets[i]:_skill_offsets[i + 1]]
+        self._skill_ids = np.zeros(self._capacity * 4, dtype=np.int32)
+        self._skill_offsets = np.zeros(self._capacity + 1, dtype=np.int64)
+        self._texts: List[bytes] = []       # compressed resume text
+        self._extra: Dict[int, Dict] = {}   # rarely present fields: warnings, error
+        self._orders: Dict[Tuple[str, bool], np.ndarray] = {}  # full sort orders until the next change
+
+    @staticmethod
+    def _words(bits: int) -> int:
+        return max(1, (bits + 63) // 64)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def copy(self) -> 'ColumnarCandidateStore':
+        """Independent copy; the compressed texts are immutable and shared"""
+        other = ColumnarCandidateStore.__new__(ColumnarCandidateStore)
+        other.__dict__.update(self.__dict__)
+        other.skill_bits = dict(self.skill_bits)
+        other.skill_names = list(self.skill_names)
+        other.strings = StringTable()
+        other.strings.values = list(self.strings.values)
+        other.strings.codes = dict(self.strings.codes)
+        other._numeric = {column: values.copy() for column, values in self._numeric.items()}
+        other._codes = {column: values.copy() for column, values in self._codes.items()}
+        other._failed = self._failed.copy()
+        other._bits = self._bits.copy()
+        other._skill_ids = self._skill_ids.copy()
+        other._skill_offsets = self._skill_offsets.copy()
+        other._texts = list(self._texts)
+        other._extra = dict(self._extra)
+        other._orders = dict(self._orders)
+        return other
+
+    def extend(self, results: Iterable[Dict]) -> List[int]:
+        """Append match results (CandidateMatcher dicts) and return their row numbers"""
+        return [self.append(result) for result in results]
+
+    def append(self, result: Dict) -> int:
+        row = self._size
+        if row == self._capacity:
+            self._grow(self._capacity * 2)
+
+        for column in NUMERIC_COLUMNS:
+            self._numeric[column][row] = result.get(column, 0.0)
+        for column in STRING_COLUMNS:
+            value = result.get(column) or ('New' if column == 'status' else '')
+            self._codes[column][row] = self.strings.intern(str(value))
+
+        self._set_skills(row, result.get('skills', ()))
+        # Fastest compression level: most of the gain for a fraction of the time
+        self._texts.append(zlib.compress(result.get('raw_text', '').encode('utf-8'), 1))
+
+        self._failed[row] = 'error' in result
+        extra = {key: result[key] for key in ('warnings', 'error') if result.get(key)}
+        if extra:
+            self._extra[row] = extra
+
+        self._size += 1
+        self._orders.clear()
+        return row
+
+    def _grow(self, capacity: int):
+        for columns in (self._numeric, self._codes):
+            for column, values in columns.items():
+                grown = np.zeros(capacity, dtype=values.dtype)
+                grown[:self._size] = values[:self._size]
+                columns[column] = grown
+        failed = np.zeros(capacity, dtype=bool)
+        failed[:self._size] = self._failed[:self._size]
+        self._failed = failed
+        bits = np.zeros((capacity, self._bits.shape[1]), dtype=np.uint64)
+        bits[:self._size] = self._bits[:self._size]
+        self._bits = bits
+        offsets = np.zeros(capacity + 1, dtype=np.int64)
+        offsets[:self._size + 1] = self._skill_offsets[:self._size + 1]
+        self._skill_offsets = offsets
+        self._capacity = capacity
+
+    def _set_skills(self, row: int, skills: Iterable[str]):
+        ids = []
+        packed = 0
+        for skill in skills:
+            # Parsed skills are already canonical, so only unknown names need normalizing
+            bit = self.skill_bits.get(skill)
+            if bit is None:
+                skill = self.skill_engine.canonical(skill)
+                bit = self.skill_bits.get(skill)
+            if bit is None:
+                # Skills outside the taxonomy get new bits, widening every bitset if needed
+                bit = self.skill_bits[skill] = len(self.skill_bits)
+                self.skill_names.append(skill)
+                if self._words(bit + 1) > self._bits.shape[1]:
+                    extra = np.zeros((self._capacity, 1), dtype=np.uint64)
+                    self._bits = np.hstack([self._bits, extra])
+            packed |= 1 << bit
+            ids.append(bit)
+
+        for word in range(self._bits.shape[1]):
+            self._bits[row, word] = (packed >> (64 * word)) & 0xFFFFFFFFFFFFFFFF
+
+        start = self._skill_offsets[row]
+        end = start + len(ids)
+        if end > len(self._skill_ids):
+            grown = np.zeros(max(end, len(self._skill_ids) * 2), dtype=np.int32)
+            grown[:start] = self._skill_ids[:start]
+            self._skill_ids = grown
+        self._skill_ids[start:end] = ids
+        self._skill_offsets[row + 1] = end
+
+    def skills(self, row: int) -> List[str]:
+        """A candidate's skills in the order they were parsed"""
+        ids = self._skill_ids[self._skill_offsets[row]:self._skill_offsets[row + 1]]
+        return [self.skill_names[bit] for bit in ids]
+
+    def skill_mask(self, skills: Iterable[str]) -> np.ndarray:
+        """Bitset of the given skills; skills no candidate has are ignored"""
+        mask = np.zeros(self._bits.shape[1], dtype=np.uint64)
+        for skill in skills:
+            bit = self.skill_bits.get(self.skill_engine.canonical(skill))
+            if bit is not None:
+                mask[bit // 64] |= np.uint64(1 << (bit % 64))
+        return mask
+
+    def column(self, name: str) -> np.ndarray:
+        """Read-only view of a numeric column over the stored rows"""
+        if name not in self._numeric:
+            raise ValueError(f"Unknown column {name!r}; choose one of {', '.join(NUMERIC_COLUMNS)}")
+        view = self._numeric[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def strings_of(self, name: str) -> List[str]:
+        """Values of a text column for every stored row"""
+        return [self.strings[code] for code in self._codes[name][:self._size]]
+
+    def skill_overlap(self, skills: Iterable[str]) -> np.ndarray:
+        """Fraction of the given skills each candidate has, for every row"""
+        skills = list(skills)
+        if not skills:
+            return np.zeros(self._size)
+        mask = self.skill_mask(skills)
+        matched = _popcount(self._bits[:self._size] & mask)
+        return matched / len({self.skill_engine.canonical(skill) for skill in skills})
+
+    def filter(self, min_score: Optional[float] = None, max_score: Optional[float] = None,
+               min_experience: Optional[float] = None, max_experience: Optional[float] = None,
+               status: Optional[str] = None, all_skills: Optional[Iterable[str]] = None,
+               any_skills: Optional[Iterable[str]] = None, include_failed: bool = True,
+               search: Optional[str] = None, include_duplicates: bool = True) -> np.ndarray:
+        """Row numbers matching every given condition, in insertion order; search is a case-insensitive substring"""
+        keep = np.ones(self._size, dtype=bool)
+        scores = self._numeric['match_score'][:self._size]
+        experience = self._numeric['experience'][:self._size]
+        if min_score is not None:
+            keep &= scores >= min_score
+        if max_score is not None:
+            keep &= scores <= max_score
+        if min_experience is not None:
+            keep &= experience >= min_experience
+        if max_experience is not None:
+            keep &= experience <= max_experience
+        if status is not None:
+            keep &= self._codes['status'][:self._size] == self.strings.code(status)
+        if not include_failed:
+            keep &= ~self._failed[:self._size]
+        if not include_duplicates:
+            keep &= self._codes['duplicate_of'][:self._size] == self.strings.code('')
+        if search:
+            needle = search.lower()
+            codes = np.array([code for code, value in enumerate(self.strings.values) if needle in value.lower()],
+                             dtype=np.int32)
+            found = np.zeros(self._size, dtype=bool)
+            for column in SEARCH_COLUMNS:
+                found |= np.isin(self._codes[column][:self._size], codes)
+            keep &= found
+
+        bits = self._bits[:self._size]
+        if all_skills:
+            canonical = {self.skill_engine.canonical(skill) for skill in all_skills}
+            if not canonical <= self.skill_bits.keys():
+                keep[:] = False  # a skill no stored candidate has
+            mask = self.skill_mask(canonical)
+            keep &= ((bits & mask) == mask).all(axis=1)
+        if any_skills:
+            keep &= (bits & self.skill_mask(any_skills)).any(axis=1)
+        return np.flatnonzero(keep)
+
+    def order(self, by: str = 'match_score', descending: bool = True,
+              rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Row numbers sorted by a numeric column, ties in insertion order; cached and read-only for all rows"""
+        if rows is None:
+            cached = self._orders.get((by, descending))
+            if cached is None:
+                cached = self.order(by, descending, np.arange(self._size))
+                cached.flags.writeable = False
+                self._orders[(by, descending)] = cached
+            return cached
+        rows = np.asarray(rows)
+        values = self.column(by)[rows]
+        keys = -values if descending else values
+        return rows[np.argsort(keys, kind='stable')]
+
+    def top_k(self, k: int, by: str = 'match_score', rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Row numbers of the k highest values of a column, best first"""
+        rows = np.arange(self._size) if rows is None else np.asarray(rows)
+        if k >= len(rows):
+            return self.order(by, rows=rows)
+        values = self.column(by)[rows]
+        top = np.argpartition(-values, k - 1)[:k]
+        return self.order(by, rows=rows[np.sort(top)])
+
+    def rescore(self, weights: Dict[str, float]):
+        """Recompute every match score from the stored component scores with new weights"""
+        n = self._size
+        scores = weighted_score(
+            self._numeric['skills_match'][:n], self._numeric['experience_match'][:n],
+            self._numeric['semantic_match'][:n], self._numeric['keywords_match'][:n], weights
+        )
+        self._numeric['match_score'][:n] = np.where(self._failed[:n], 0.0, scores)
+        self._orders.clear()
+
+    def set_status(self, row: int, status: str):
+        self._codes['status'][row] = self.strings.intern(status)
+
+    def duplicates_of(self, row: int) -> np.ndarray:
+        """Rows reported as near-duplicates of the given row"""
+        filename = self._codes['filename'][row]
+        return np.flatnonzero(self._codes['duplicate_of'][:self._size] == filename)
+
+    def raw_text(self, row: int) -> str:
+        return zlib.decompress(self._texts[row]).decode('utf-8')
+
+    def row(self, row: int, with_text: bool = True) -> Dict:
+        """The stored candidate as a CandidateMatcher result dict"""
+        if not 0 <= row < self._size:
+            raise IndexError(row)
+        result = {column: self.strings[self._codes[column][row]] for column in STRING_COLUMNS}
+        result.update({column: float(self._numeric[column][row]) for column in NUMERIC_COLUMNS})
+        result['skills'] = self.skills(row)
+        result['warnings'] = list(self._extra.get(row, {}).get('warnings', []))
+        if 'error' in self._extra.get(row, {}):
+            result['error'] = self._extra[row]['error']
+        if with_text:
+            result['raw_text'] = self.raw_text(row)
+        return result
+
+    def rows(self, rows: Iterable[int], with_text: bool = False) -> List[Dict]:
+        return [self.row(int(row), with_text) for row in rows]
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the stored rows, excluding the skill vocabulary"""
+        arrays = list(self._numeric.values()) + list(self._codes.values()) + [self._failed, self._bits]
+        total = sum(values[:self._size].nbytes for values in arrays)
+        total += self._skill_ids[:self._skill_offsets[self._size]].nbytes + self._skill_offsets.nbytes
+        total += sum(len(text) for text in self._texts)
+        total += sum(len(value) for value in self.strings.values)
+        return total
@@ -0,0 +1,35 @@
+import json
+
+from batch_cli import load_checkpoint
+
+
+def write_lines(path, *lines):
+    path.write_bytes(b''.join(lines))
+
+
+def test_checkpoint_drops_a_final_line_cut_short(tmp_path):
+    output = tmp_path / 'results.jsonl'
+    first, second = b'{"file": "a.pdf", "match_score": 80.0}\n', b'{"file": "b.pdf", "match_score": 60.0}\n'
+    write_lines(output, first, second, b'{"file": "c.pd')
+
+    assert [record['file'] for record in load_checkpoint(str(output))] == ['a.pdf', 'b.pdf']
+    assert output.read_bytes() == first + second
+
+
+def test_checkpoint_drops_an_unreadable_final_line_only(tmp_path):
+    output = tmp_path / 'results.jsonl'
+    records = [json.dumps({'file': f'{name}.pdf'}).encode() + b'\n' for name in 'abc']
+    write_lines(output, records[0], b'not json\n', records[1], records[2], b'{"file": \n')
+
+    assert [record['file'] for record in load_checkpoint(str(output))] == ['a.pdf', 'b.pdf', 'c.pdf']
+    assert output.read_bytes() == records[0] + b'not json\n' + records[1] + records[2]
+
+
+def test_complete_checkpoint_is_left_alone(tmp_path):
+    output = tmp_path / 'results.jsonl'
+    content = b'{"file": "a.pdf"}\n{"file": "b.pdf"}\n'
+    write_lines(output, content)
+
+    assert len(list(load_checkpoint(str(output)))) == 2
+    assert output.read_bytes() == content
+    assert list(load_checkpoint(str(tmp_path / 'missing.jsonl'))) == []
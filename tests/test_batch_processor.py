@@ -0,0 +1,33 @@
+import queue
+
+from utils.batch_processor import _report_failure, process_resumes
+
+JOB_DESCRIPTION = 'Python developer with 3 years experience in Django and SQL'
+RESUMES = [
+    ('a.txt', b'Jane Doe\njane@example.com\nPython and Django developer, 5 years experience\n'),
+    ('b.txt', b'John Smith\njohn@example.com\nJava developer with SQL, 2 years experience\n'),
+]
+
+
+def scores(results):
+    return {result['filename']: result['match_score'] for result in results}
+
+
+def test_single_worker_matches_in_process_parsing():
+    pooled = list(process_resumes(RESUMES, JOB_DESCRIPTION, workers=1))
+    inline = list(process_resumes(RESUMES, JOB_DESCRIPTION, workers=0))
+    assert not any('error' in result for result in pooled)
+    assert scores(pooled) == scores(inline)
+
+
+def test_single_worker_enforces_the_timeout():
+    # A spawned worker takes far longer than this to start, so the deadline passes first
+    results = list(process_resumes(RESUMES[:1], JOB_DESCRIPTION, workers=1, timeout=0.001))
+    assert [result['error'] for result in results] == ['Timed out after 0.001s']
+
+
+def test_pool_failure_is_reported_as_its_error():
+    completed = queue.Queue()
+    _report_failure(completed, 3, 'c.pdf')(RuntimeError('worker died'))
+    index, result, worker_metrics = completed.get_nowait()
+    assert (index, result['filename'], result['error'], worker_metrics) == (3, 'c.pdf', 'worker died', None)
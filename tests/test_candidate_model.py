@@ -0,0 +1,40 @@
+import random
+
+from models.candidate_model import Candidate, CandidatePool
+from utils.config import Config
+from utils.dedup import minhash_signature, similarity
+
+
+def make_candidate(name, score):
+    return Candidate(name=name, email=f'{name.lower()}@example.com', phone='', skills=['python'],
+                     experience=3.0, education='', resume_text=f'{name} python developer', match_score=score)
+
+
+def test_status_update_moves_the_dashboard_counts(tmp_path):
+    pool = CandidatePool(str(tmp_path / 'pool.sqlite3'))
+    pool.add_candidates([make_candidate('Ada', 90.0), make_candidate('Ben', 40.0)])
+    ada = next(candidate for candidate in pool.query() if candidate.name == 'Ada')
+    assert pool.stats()['status_counts'] == {'New': 2}
+
+    pool.update_status(ada.id, 'Shortlisted')
+    assert pool.stats()['status_counts'] == {'New': 1, 'Shortlisted': 1}
+    assert [candidate.name for candidate in pool.query(status='Shortlisted')] == ['Ada']
+
+    # The running counts are persisted with the change
+    reopened = CandidatePool(str(tmp_path / 'pool.sqlite3'))
+    assert reopened.stats()['status_counts'] == {'New': 1, 'Shortlisted': 1}
+
+
+def test_duplicate_threshold_below_the_default_is_honoured():
+    rng = random.Random(0)
+    words = [f'word{rng.randrange(5000)}' for _ in range(400)]
+    edited = [f'edit{i}' if i % 15 == 0 else word for i, word in enumerate(words)]
+    original, copy = make_candidate('Ada', 80.0), make_candidate('Ada', 80.0)
+    original.resume_text, copy.resume_text = ' '.join(words), ' '.join(edited)
+    estimate = similarity(minhash_signature(original.resume_text), minhash_signature(copy.resume_text))
+    assert 0.6 <= estimate < Config.DEDUP_THRESHOLD
+
+    pool = CandidatePool()
+    [original_id] = pool.add_candidates([original])
+    assert pool.find_duplicate(copy) is None
+    assert pool.find_duplicate(copy, threshold=0.6) == original_id
@@ -0,0 +1,12 @@
+import pytest
+
+from benchmarks.import_time import MODULES, report
+from utils.config import Config
+
+
+@pytest.mark.parametrize('module', MODULES)
+def test_cold_start_stays_within_budget(module):
+    # report() imports the module in a fresh interpreter, so nothing is already loaded
+    result = report(module)
+    assert result['lazy_loaded_eagerly'] == []
+    assert result['total_ms'] <= Config.COLD_START_BUDGET_MS, result['slowest']
@@ -0,0 +1,42 @@
+import pytest
+
+from utils.matcher import SCORE_COMPONENTS, CandidateMatcher
+
+FIELDS = ('match_score',) + tuple(f'{component}_match' for component in SCORE_COMPONENTS)
+
+JOB_DESCRIPTIONS = [
+    'Senior Python developer with 5+ years experience in Django, SQL and AWS',
+    'Data scientist: machine learning, pandas, TensorFlow; 3 years of experience required',
+    'Frontend engineer skilled in JavaScript, React and CSS',
+]
+CANDIDATES = [
+    {'raw_text': 'Python developer, 6 years building Django services on AWS with PostgreSQL',
+     'skills': ['python', 'django', 'aws', 'postgresql'], 'experience': 6.0},
+    {'raw_text': 'Machine learning engineer using pandas, scikit-learn and TensorFlow',
+     'skills': ['machine learning', 'pandas', 'tensorflow'], 'experience': 2.5},
+    {'raw_text': 'React and JavaScript developer. React, React, CSS and HTML.',
+     'skills': ['react', 'javascript', 'css', 'html'], 'experience': 1.0},
+    {'raw_text': '', 'skills': [], 'experience': 0.0},
+    {'raw_text': 'the and of to in with for on at by', 'skills': [], 'experience': 0.0},
+]
+
+
+def test_batch_scores_match_per_pair_scores():
+    matcher = CandidateMatcher(semantic_mode='tfidf')
+    for job_description in JOB_DESCRIPTIONS:
+        batch = matcher.calculate_matches([dict(candidate) for candidate in CANDIDATES], job_description)
+        for candidate, result in zip(CANDIDATES, batch):
+            expected = matcher.calculate_match(dict(candidate), job_description)
+            for field in FIELDS:
+                assert result[field] == pytest.approx(expected[field], abs=1e-9), field
+
+
+def test_match_matrix_matches_per_pair_scores():
+    matcher = CandidateMatcher(semantic_mode='tfidf')
+    matrix = matcher.calculate_match_matrix([dict(candidate) for candidate in CANDIDATES], JOB_DESCRIPTIONS)
+    assert matrix.shape == (len(CANDIDATES), len(JOB_DESCRIPTIONS))
+    for i, candidate in enumerate(CANDIDATES):
+        for j, job_description in enumerate(JOB_DESCRIPTIONS):
+            expected = matcher.calculate_match(dict(candidate), job_description)
+            for field in FIELDS:
+                assert getattr(matrix, field)[i, j] == pytest.approx(expected[field], abs=1e-9), (i, j, field)
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from utils.config import Config
+from utils.parse_cache import ParseCache
+from utils.resume_parser import ResumeParser
+from utils.skill_engine import get_skill_engine
+
+RESUME = b'Jane Doe\njane@example.com\nRust and Zig developer with 5 years experience\n'
+
+
+@pytest.fixture
+def taxonomy(tmp_path, monkeypatch):
+    """Write a taxonomy file and point Config at it; returns a function that rewrites it"""
+    path = tmp_path / 'taxonomy.json'
+    monkeypatch.setattr(Config, 'SKILLS_TAXONOMY_PATH', str(path))
+
+    def write(skills):
+        path.write_text(json.dumps({'version': 1, 'skills': skills}), encoding='utf-8')
+        get_skill_engine.cache_clear()
+
+    yield write
+    get_skill_engine.cache_clear()
+
+
+def parse_with_cache(cache_path):
+    cache = ParseCache(str(cache_path), parser_version=ResumeParser.version())
+    try:
+        return ResumeParser(cache=cache).parse_resume_bytes(RESUME, 'resume.txt')
+    finally:
+        cache.close()
+
+
+def test_taxonomy_change_is_not_served_from_the_parse_cache(tmp_path, taxonomy):
+    taxonomy({'rust': []})
+    assert parse_with_cache(tmp_path / 'cache.sqlite3')['skills'] == ['rust']
+
+    taxonomy({'rust': [], 'zig': []})
+    assert parse_with_cache(tmp_path / 'cache.sqlite3')['skills'] == ['rust', 'zig']
+
+
+@pytest.mark.parametrize('limit', ['MAX_TEXT_CHARS', 'MAX_PDF_PAGES'])
+def test_version_changes_with_extraction_limits(taxonomy, monkeypatch, limit):
+    taxonomy({'rust': []})
+    version = ResumeParser.version()
+
+    monkeypatch.setattr(Config, limit, getattr(Config, limit) + 1)
+    assert ResumeParser.version() != version
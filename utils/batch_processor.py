@@ -0,0 +1,296 @@
+import multiprocessing
+import queue
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from utils.config import Config
+from utils.dedup import DuplicateIndex, minhash_signature, signature_from_bytes
+from utils.matcher import SCORE_COMPONENTS, CandidateMatcher
+from utils.metrics import metrics
+from utils.parse_cache import ParseCache, content_hash
+from utils.resume_parser import ResumeParser, error_result, oversize_message
+
+# Per-process parser, created once by the pool initializer
+_parser = None
+# Scoring happens only in the main process, in chunks
+_matcher = None
+
+# Spawned, since forking the threaded Streamlit server can copy a lock another thread holds
+_pool_context = multiprocessing.get_context('spawn')
+
+# What a near-duplicate takes from its original; the rest comes from its own parse
+_SHARED_FIELDS = ('filename', 'error', 'match_score') + tuple(f'{component}_match' for component in SCORE_COMPONENTS)
+
+
+def _init_worker():
+    """Create the parser used by this process"""
+    global _parser
+    _parser = ResumeParser()
+
+
+def _parse(parser: ResumeParser, filename: str, data: Union[bytes, memoryview],
+           with_signature: bool = False) -> Dict:
+    """Parse one resume, adding its MinHash signature if asked for"""
+    resume_data = parser.parse_resume_bytes(data, filename)
+    resume_data['filename'] = filename
+    if with_signature:
+        resume_data['minhash'] = minhash_signature(resume_data['raw_text']).tobytes()
+    return resume_data
+
+
+def _parse_task(index: int, filename: str, data: Union[bytes, memoryview],
+                collect_metrics: Optional[bool] = None,
+                with_signature: bool = False) -> Tuple[int, Dict, Optional[Dict]]:
+    """Parse one resume in a pool worker, returning the stage timings it recorded"""
+    if collect_metrics is not None:
+        metrics.enabled = collect_metrics
+    if _parser is None:
+        _init_worker()
+
+    try:
+        result = _parse(_parser, filename, data, with_signature)
+    except Exception as e:
+        result = error_result(str(e), filename)
+
+    return index, result, metrics.drain() if collect_metrics else None
+
+
+def _report_failure(completed: queue.Queue, index: int, filename: str) -> Callable[[BaseException], None]:
+    """Error callback that reports a task the pool could not run as its result, instead of a timeout"""
+    def report(error: BaseException):
+        completed.put((index, error_result(str(error) or type(error).__name__, filename), None))
+    return report
+
+
+def _refusal(data: Union[bytes, memoryview, Exception]) -> Optional[str]:
+    """Why content is not parsed at all: the error that stood in for it, or its size"""
+    if isinstance(data, Exception):
+        return str(data)
+    return oversize_message(len(data))
+
+
+def _load_cached(parser: ResumeParser, filename: str, data: Union[bytes, memoryview]) -> Optional[Dict]:
+    """A resume's parse from the parser's cache, or None on a miss"""
+    if parser.cache is None:
+        return None
+
+    parsed = parser.get_cached(content_hash(data))
+    if parsed is not None:
+        parsed['filename'] = filename
+    return parsed
+
+
+class _NearDuplicates:
+    """Near-duplicate detection within one call to process_resumes, keeping only each original's scores"""
+
+    def __init__(self, threshold: float):
+        self.index = DuplicateIndex(threshold)
+        self.originals: Dict[int, Dict] = {}
+
+    def find(self, resume_data: Dict) -> Optional[Tuple[int, float]]:
+        """(key, similarity) of the earlier resume that resume_data nearly duplicates"""
+        if 'minhash' not in resume_data:
+            resume_data['minhash'] = minhash_signature(resume_data['raw_text']).tobytes()
+        return self.index.find(signature_from_bytes(resume_data['minhash']))
+
+    def add(self, key: int, resume_data: Dict):
+        self.index.add(key, signature_from_bytes(resume_data['minhash']))
+
+    def remember(self, key: int, result: Dict):
+        self.originals[key] = {field: result[field] for field in _SHARED_FIELDS if field in result}
+
+    def duplicate(self, key: int, similarity: float, resume_data: Dict) -> Dict:
+        """The result to report for resume_data as a near-duplicate of key"""
+        original = self.originals[key]
+        return {
+            **resume_data,
+            **original,
+            'filename': resume_data['filename'],
+            'duplicate_of': original['filename'],
+            'duplicate_similarity': similarity
+        }
+
+
+class _ChunkScorer:
+    """Collects parsed resumes and scores them together with calculate_matches"""
+
+    def __init__(self, matcher: CandidateMatcher, job_description: str,
+                 duplicates: Optional[_NearDuplicates], chunk_size: int):
+        self.matcher = matcher
+        self.job_description = job_description
+        self.duplicates = duplicates
+        self.chunk_size = chunk_size
+        self.pending: List[Tuple[int, Dict]] = []
+
+    def add(self, index: int, resume_data: Dict) -> List[Dict]:
+        """Queue a parse for scoring, returning the chunk's results once it is full"""
+        self.pending.append((index, resume_data))
+        return self.flush() if len(self.pending) >= self.chunk_size else []
+
+    def flush(self) -> List[Dict]:
+        """Score the queued parses, returning their results in the order they were added"""
+        chunk, self.pending = self.pending, []
+        originals = []
+        found = {}
+        for index, resume_data in chunk:
+            if 'error' in resume_data:
+                continue
+            if self.duplicates is not None:
+                # Found before scoring, so a near-duplicate is never scored
+                found[index] = self.duplicates.find(resume_data)
+                if found[index] is not None:
+                    continue
+                self.duplicates.add(index, resume_data)
+            originals.append((index, resume_data))
+
+        scored = dict(zip((index for index, _ in originals), self._score([data for _, data in originals])))
+        if self.duplicates is not None:
+            for index, result in scored.items():
+                self.duplicates.remember(index, result)
+
+        results = []
+        for index, resume_data in chunk:
+            if index in scored:
+                results.append(scored[index])
+            elif found.get(index) is not None:
+                results.append(self.duplicates.duplicate(*found[index], resume_data))
+            else:
+                results.append(resume_data)
+        return results
+
+    def _score(self, candidates: List[Dict]) -> List[Dict]:
+        if not candidates:
+            return []
+        try:
+            return self.matcher.calculate_matches(candidates, self.job_description)
+        except Exception:
+            # Score one at a time so only the resume that fails is reported as an error
+            results = []
+            for candidate in candidates:
+                try:
+                    results.append(self.matcher.calculate_match(candidate, self.job_description))
+                except Exception as e:
+                    results.append(error_result(str(e), candidate['filename']))
+            return results
+
+
+def process_resumes(files: Iterable[Tuple[str, Union[bytes, memoryview, Exception]]], job_description: str,
+                    workers: Optional[int] = None, timeout: Optional[float] = None,
+                    cache: Optional[ParseCache] = None,
+                    dedup_threshold: Optional[float] = None, parser: Optional[ResumeParser] = None,
+                    matcher: Optional[CandidateMatcher] = None) -> Iterator[Dict]:
+    """Parse resumes in a process pool and score them here in chunks, yielding results as they finish"""
+    global _matcher
+    workers = Config.PARSE_WORKERS if workers is None else workers
+    timeout = timeout or Config.PARSE_TIMEOUT_SECONDS
+
+    # Only this process reads and writes the cache; workers never touch it
+    if parser is None:
+        parser = ResumeParser(cache=cache)
+
+    duplicates = _NearDuplicates(dedup_threshold) if dedup_threshold is not None else None
+    with_signature = duplicates is not None
+
+    if matcher is None:
+        if _matcher is None:
+            _matcher = CandidateMatcher()
+        matcher = _matcher
+    scorer = _ChunkScorer(matcher, job_description, duplicates, Config.SCORE_CHUNK_SIZE)
+
+    # Any pool, even of one worker, enforces the timeout; workers=0 parses here without one
+    if workers <= 0:
+        for index, (filename, data) in enumerate(files):
+            message = _refusal(data)
+            if message is not None:
+                yield from scorer.add(index, error_result(message, filename))
+                continue
+
+            # The parser looks up and fills its own cache
+            try:
+                resume_data = _parse(parser, filename, data, with_signature)
+            except Exception as e:
+                resume_data = error_result(str(e), filename)
+            yield from scorer.add(index, resume_data)
+        yield from scorer.flush()
+        return
+
+    completed = queue.Queue()
+    pool = _pool_context.Pool(workers, initializer=_init_worker)
+    pending = {}        # index -> (filename, deadline)
+    timed_out = set()   # indexes whose workers are presumed stuck
+    items = enumerate(files)
+    exhausted = False
+
+    try:
+        while True:
+            # Only submit to free workers so a task's deadline starts when it does
+            while not exhausted and len(pending) < workers - len(timed_out):
+                try:
+                    index, (filename, data) = next(items)
+                except StopIteration:
+                    exhausted = True
+                    break
+
+                # Refused here, before the upload is copied and sent to a worker
+                message = _refusal(data)
+                if message is not None:
+                    yield error_result(message, filename)
+                    continue
+
+                resume_data = _load_cached(parser, filename, data)
+                if resume_data is not None:
+                    yield from scorer.add(index, resume_data)
+                    continue
+
+                # Buffers cannot be pickled, so copy them to bytes for the worker
+                pool.apply_async(_parse_task,
+                                 (index, filename, bytes(data), metrics.enabled, with_signature),
+                                 callback=completed.put,
+                                 error_callback=_report_failure(completed, index, filename))
+                pending[index] = (filename, time.monotonic() + timeout)
+
+            if not pending:
+                break
+
+            if completed.empty():
+                # Nothing else is ready, so score what has arrived rather than hold it while waiting
+                yield from scorer.flush()
+
+            next_deadline = min(deadline for _, deadline in pending.values())
+            try:
+                index, resume_data, worker_metrics = completed.get(
+                    timeout=max(0.0, next_deadline - time.monotonic()))
+            except queue.Empty:
+                now = time.monotonic()
+                for index, (filename, deadline) in list(pending.items()):
+                    if deadline <= now:
+                        del pending[index]
+                        timed_out.add(index)
+                        yield error_result(f'Timed out after {timeout:g}s', filename)
+
+                if len(timed_out) >= workers:
+                    # Every worker is stuck; nothing else is in flight
+                    pool.terminate()
+                    pool = _pool_context.Pool(workers, initializer=_init_worker)
+                    timed_out.clear()
+                continue
+
+            if worker_metrics:
+                metrics.merge(worker_metrics)
+
+            if index not in pending:
+                # A timed-out task finished after all; its worker is free again
+                timed_out.discard(index)
+                continue
+
+            del pending[index]
+            parser.store_cached(resume_data)
+            yield from scorer.add(index, resume_data)
+
+        yield from scorer.flush()
+    finally:
+        if pending or timed_out:
+            pool.terminate()
+        else:
+            pool.close()
+        pool.join()
@@ -1,4 +1,7 @@
 # Configuration settings for the recruitment system
+import os
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 class Config:
     # Matching weights
@@ -15,7 +18,48 @@ class Config:
     # File settings
     ALLOWED_EXTENSIONS = ['.pdf', '.docx', '.txt']
     MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+    MAX_PDF_PAGES = 30
+    MAX_TEXT_CHARS = 200000  # Per resume, after extraction
+    
+    # Skills taxonomy shared by the resume parser and matcher
+    SKILLS_TAXONOMY_PATH = os.path.join(BASE_DIR, 'data', 'skills_taxonomy.json')
+    
+    # Batch processing settings
+    PARSE_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+    PARSE_TIMEOUT_SECONDS = 60  # Per resume
+    SCORE_CHUNK_SIZE = 64  # Parsed resumes scored together in the main process
+    
+    # Parse cache settings
+    PARSE_CACHE_PATH = os.path.join(BASE_DIR, 'cache', 'parse_cache.sqlite3')
+    PARSE_CACHE_MAX_BYTES = 256 * 1024 * 1024  # 256MB
+    
+    # Candidate pool storage
+    CANDIDATE_DB_PATH = os.path.join(BASE_DIR, 'storage', 'candidates.sqlite3')
+    POOL_PAGE_SIZE = 50
+    
+    # Semantic matching: 'tfidf' or 'embedding' (sentence-transformers, CPU, offline)
+    SEMANTIC_MODE = 'tfidf'
+    EMBEDDING_MODEL_PATH = os.path.join(BASE_DIR, 'storage', 'models', 'all-MiniLM-L6-v2')
+    EMBEDDING_STORE_DIR = os.path.join(BASE_DIR, 'storage', 'embeddings')
+    EMBEDDING_BATCH_SIZE = 32
+    
+    # Two-stage matching: skill-index retrieval keeps the top N for full scoring
+    RERANK_TOP_N = 200
+    
+    # Matching runs remembered per (job description, resumes, weights, matcher version)
+    RESULT_CACHE_ENTRIES = 16
+    
+    # Near-duplicates: estimated word trigram similarity at which an upload reuses an earlier one's score
+    MINHASH_PERMUTATIONS = 128
+    DEDUP_THRESHOLD = 0.8
+    
+    # Per-stage timing of the parse/match pipeline (can be toggled on the Settings page)
+    METRICS_ENABLED = False
+    
+    # Import-time budget per core module, checked by `python -m benchmarks.import_time --check`
+    COLD_START_BUDGET_MS = 500
     
     # Display settings
     TOP_CANDIDATES_DISPLAY = 10
+    RESULTS_PAGE_SIZE = 50  # Candidate Matching results per page
     SCORE_DECIMAL_PLACES = 1
\ No newline at end of file
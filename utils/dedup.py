@@ -0,0 +1,110 @@
+import threading
+import zlib
+from typing import Dict, Hashable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from utils.config import Config
+from utils.document import ParsedDocument
+
+# Fixed hash functions, so signatures stay comparable across processes and restarts
+_SEED = 20240611
+_MAX_PERMUTATIONS = 1024
+_rng = np.random.default_rng(_SEED)
+# Multiply-shift hashing: h(x) = ((a * x + b) mod 2**64) >> 32 with a odd
+_A = _rng.integers(1, 2 ** 63, size=_MAX_PERMUTATIONS, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+_B = _rng.integers(0, 2 ** 63, size=_MAX_PERMUTATIONS, dtype=np.uint64)
+# Combine three token hashes into one shingle hash
+_SHINGLE_MULTIPLIERS = (np.uint64(0x9E3779B97F4A7C15), np.uint64(0xC2B2AE3D27D4EB4F))
+
+
+def minhash_signature(text: Union[str, ParsedDocument], num_perm: Optional[int] = None) -> np.ndarray:
+    """MinHash signature of a text's word trigrams as uint32 values, empty below three words"""
+    num_perm = num_perm or Config.MINHASH_PERMUTATIONS
+    tokens = ParsedDocument.of(text).tokens
+    if len(tokens) < 3:
+        return np.zeros(0, dtype=np.uint32)
+
+    token_hashes = np.fromiter((zlib.crc32(token.encode('utf-8')) for token in tokens),
+                               dtype=np.uint64, count=len(tokens))
+    # Arithmetic on uint64 arrays wraps around, which is what the hashing relies on
+    shingles = np.unique(
+        token_hashes[:-2] * _SHINGLE_MULTIPLIERS[0] + token_hashes[1:-1] * _SHINGLE_MULTIPLIERS[1] +
+        token_hashes[2:]
+    )
+    # One row per hash function; updated in place to avoid temporaries
+    hashed = _A[:num_perm, None] * shingles[None, :]
+    hashed += _B[:num_perm, None]
+    hashed >>= np.uint64(32)
+    return hashed.min(axis=1).astype(np.uint32)
+
+
+def signature_from_bytes(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype=np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the texts behind two signatures"""
+    if len(a) == 0 or len(a) != len(b):
+        return 0.0
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+def _lsh_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """(bands, rows) minimizing the false positive and false negative areas at threshold"""
+    s = np.linspace(0.0, 1.0, 201)
+    below = s < threshold
+    best, best_error = (1, num_perm), float('inf')
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        probability = 1 - (1 - s ** rows) ** bands
+        # Areas on the uniform grid; the step is the same for every layout so it is left out
+        error = probability[below].sum() + (1 - probability[~below]).sum()
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class DuplicateIndex:
+    """Locality-sensitive hashing index over MinHash signatures, banded for its threshold"""
+
+    def __init__(self, threshold: Optional[float] = None, num_perm: Optional[int] = None):
+        self.threshold = Config.DEDUP_THRESHOLD if threshold is None else threshold
+        self.num_perm = num_perm or Config.MINHASH_PERMUTATIONS
+        self.bands, self.rows = _lsh_bands(self.threshold, self.num_perm)
+        self.signatures: Dict[Hashable, np.ndarray] = {}
+        self._buckets: List[Dict[bytes, List[Hashable]]] = [{} for _ in range(self.bands)]
+        self._lock = threading.Lock()
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def add(self, key: Hashable, signature: np.ndarray):
+        if len(signature) != self.num_perm:
+            return
+        with self._lock:
+            self.signatures[key] = signature
+            for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+                bucket.setdefault(band_key, []).append(key)
+
+    def find(self, signature: np.ndarray, threshold: Optional[float] = None) -> Optional[Tuple[Hashable, float]]:
+        """The most similar indexed key at or above the threshold, with its similarity"""
+        if len(signature) != self.num_perm:
+            return None
+        threshold = self.threshold if threshold is None else threshold
+        with self._lock:
+            candidates = set()
+            for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+                candidates.update(bucket.get(band_key, ()))
+            best = None
+            for key in candidates:
+                score = similarity(signature, self.signatures[key])
+                if score >= threshold and (best is None or score > best[1]):
+                    best = (key, score)
+        return best
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.signatures
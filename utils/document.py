@@ -0,0 +1,79 @@
+import re
+import threading
+from collections import Counter, OrderedDict
+from functools import cached_property
+from typing import List, Union
+
+# Same tokenization as scikit-learn's default token_pattern
+TOKEN_PATTERN = re.compile(r'(?u)\b\w\w+\b')
+
+
+class ParsedDocument:
+    """A resume or job description text whose lowered text, lines and tokens are computed once, on first use"""
+
+    def __init__(self, text: str):
+        self.text = text
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def lines(self) -> List[str]:
+        return self.text.split('\n')
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        """Lowercase word tokens, as scikit-learn's vectorizers would produce"""
+        return TOKEN_PATTERN.findall(self.lower)
+
+    @cached_property
+    def content_tokens(self) -> List[str]:
+        """Tokens without English stop words, the input to TF-IDF scoring"""
+        # scikit-learn takes seconds to import; only load it once tokens are needed
+        from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+        return [token for token in self.tokens if token not in ENGLISH_STOP_WORDS]
+
+    @cached_property
+    def term_counts(self) -> Counter:
+        return Counter(self.content_tokens)
+
+    @cached_property
+    def token_set(self) -> frozenset:
+        return frozenset(self.tokens)
+
+    @classmethod
+    def of(cls, text: Union[str, 'ParsedDocument']) -> 'ParsedDocument':
+        """Document for a text, reusing the one made earlier for the same text if still cached"""
+        if isinstance(text, ParsedDocument):
+            return text
+        return document_cache.get(text)
+
+
+class DocumentCache:
+    """Small LRU of recent documents keyed by their text"""
+
+    def __init__(self, max_size: int = 512):
+        self.max_size = max_size
+        self._documents = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, text: str) -> ParsedDocument:
+        with self._lock:
+            document = self._documents.get(text)
+            if document is not None:
+                self._documents.move_to_end(text)
+                return document
+
+            document = ParsedDocument(text)
+            self._documents[text] = document
+            if len(self._documents) > self.max_size:
+                self._documents.popitem(last=False)
+            return document
+
+    def clear(self):
+        with self._lock:
+            self._documents.clear()
+
+
+document_cache = DocumentCache()
@@ -0,0 +1,233 @@
+import contextlib
+import json
+import os
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.config import Config
+
+
+@contextlib.contextmanager
+def _file_lock(path: str):
+    """Hold an exclusive lock on path, shared with other processes"""
+    with open(path, 'a+b') as f:
+        if os.name == 'nt':
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class EmbeddingStore:
+    """Append-only store of unit-length embeddings in a memory-mapped .npy file, one row per content hash"""
+
+    def __init__(self, directory: str, dim: int, initial_capacity: int = 1024):
+        self.directory = directory
+        self.dim = dim
+        self.vectors_path = os.path.join(directory, 'vectors.npy')
+        self.index_path = os.path.join(directory, 'index.json')
+        self.lock_path = os.path.join(directory, 'lock')
+        self.hashes = []
+        self.rows = {}
+        self._index_stamp = None
+        self._lock = threading.RLock()
+        os.makedirs(directory, exist_ok=True)
+
+        with self._locked():
+            if os.path.exists(self.index_path) and os.path.exists(self.vectors_path):
+                self._reload()
+                if self._vectors.shape[1] != dim:
+                    raise ValueError(
+                        f"Embedding store at {directory} holds {self._vectors.shape[1]}-d vectors, expected {dim}"
+                    )
+            else:
+                self._vectors = np.lib.format.open_memmap(
+                    self.vectors_path, mode='w+', dtype=np.float32, shape=(initial_capacity, dim)
+                )
+                self.flush()
+
+    @contextlib.contextmanager
+    def _locked(self):
+        # Processes sharing the directory, such as the app and batch_cli, take turns through the lock file
+        with self._lock, _file_lock(self.lock_path):
+            yield
+
+    def _reload(self):
+        """Pick up rows appended by another process since this one last looked"""
+        stat = os.stat(self.index_path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._index_stamp:
+            return
+
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            self.hashes = json.load(f)['hashes']
+        # The file may have been replaced by a larger one
+        self._vectors = np.load(self.vectors_path, mmap_mode='r+')
+        self.rows = {content_hash: row for row, content_hash in enumerate(self.hashes)}
+        self._index_stamp = stamp
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def __contains__(self, content_hash: str) -> bool:
+        return content_hash in self.rows
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """Stored vectors in insertion order (a view onto the memory map)"""
+        return self._vectors[:len(self.hashes)]
+
+    def get(self, content_hashes: Sequence[str]) -> np.ndarray:
+        with self._locked():
+            if any(content_hash not in self.rows for content_hash in content_hashes):
+                self._reload()
+            return self._vectors[[self.rows[content_hash] for content_hash in content_hashes]]
+
+    def add(self, content_hashes: Sequence[str], vectors: np.ndarray):
+        """Store vectors for hashes not already present"""
+        with self._locked():
+            self._reload()
+            new = [(content_hash, vector) for content_hash, vector in zip(content_hashes, vectors)
+                   if content_hash not in self.rows]
+            if not new:
+                return
+
+            self._reserve(len(self.hashes) + len(new))
+            start = len(self.hashes)
+            self._vectors[start:start + len(new)] = np.stack([vector for _, vector in new])
+            for offset, (content_hash, _) in enumerate(new):
+                self.rows[content_hash] = start + offset
+                self.hashes.append(content_hash)
+            self.flush()
+
+    def top_k(self, query: np.ndarray, k: int) -> Tuple[List[str], np.ndarray]:
+        """Hashes and cosine scores of the k stored vectors closest to query"""
+        with self._locked():
+            self._reload()
+            scores = self.vectors @ query.astype(np.float32)
+            k = min(k, len(scores))
+            if k == 0:
+                return [], scores[:0]
+
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best])]
+            return [self.hashes[row] for row in best], scores[best]
+
+    def _reserve(self, size: int):
+        """Grow the memory-mapped file so it holds at least size rows"""
+        capacity = self._vectors.shape[0]
+        if size <= capacity:
+            return
+
+        while capacity < size:
+            capacity *= 2
+        old = self._vectors
+        tmp_path = self.vectors_path + '.tmp'
+        grown = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32, shape=(capacity, self.dim))
+        grown[:len(self.hashes)] = old[:len(self.hashes)]
+        grown.flush()
+        del old, grown
+        self._vectors = None
+        os.replace(tmp_path, self.vectors_path)
+        self._vectors = np.load(self.vectors_path, mmap_mode='r+')
+
+    def flush(self):
+        """Write out the vectors, then the index that makes them visible; called with the store locked"""
+        self._vectors.flush()
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'dim': self.dim, 'hashes': self.hashes}, f)
+        os.replace(tmp_path, self.index_path)
+        stat = os.stat(self.index_path)
+        self._index_stamp = (stat.st_mtime_ns, stat.st_size)
+
+
+class EmbeddingEncoder:
+    """Sentence-transformer encoder that runs on CPU, offline, from the model saved in Config.EMBEDDING_MODEL_PATH"""
+
+    def __init__(self, model_path: Optional[str] = None, batch_size: Optional[int] = None):
+        self.model_path = model_path or Config.EMBEDDING_MODEL_PATH
+        self.batch_size = batch_size or Config.EMBEDDING_BATCH_SIZE
+        self._model = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            if not os.path.isdir(self.model_path):
+                raise FileNotFoundError(f"No embedding model found at {self.model_path}")
+            os.environ.setdefault('HF_HUB_OFFLINE', '1')
+            os.environ.setdefault('TRANSFORMERS_OFFLINE', '1')
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_path, device='cpu')
+        return self._model
+
+    @property
+    def dim(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(os.path.normpath(self.model_path))
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Unit-length float32 embeddings, encoded in batches"""
+        return self.model.encode(
+            texts, batch_size=self.batch_size, convert_to_numpy=True,
+            normalize_embeddings=True, show_progress_bar=False
+        ).astype(np.float32)
+
+
+class ResumeEmbedder:
+    """Encodes resumes once per content hash and scores job descriptions against them"""
+
+    def __init__(self, encoder: Optional[EmbeddingEncoder] = None, store_dir: Optional[str] = None):
+        self.encoder = encoder or EmbeddingEncoder()
+        self.store_dir = store_dir or Config.EMBEDDING_STORE_DIR
+        self._store = None
+
+    @property
+    def store(self) -> EmbeddingStore:
+        if self._store is None:
+            # One store per model, since vectors from different models are not comparable
+            self._store = EmbeddingStore(os.path.join(self.store_dir, self.encoder.name), self.encoder.dim)
+        return self._store
+
+    def embed(self, texts: List[str], content_hashes: List[str]) -> np.ndarray:
+        """Embeddings for resumes, encoding only those not already stored"""
+        missing = {}
+        for text, content_hash in zip(texts, content_hashes):
+            if content_hash not in self.store and content_hash not in missing:
+                missing[content_hash] = text
+
+        if missing:
+            self.store.add(list(missing), self.encoder.encode(list(missing.values())))
+        return self.store.get(content_hashes)
+
+    def score(self, texts: List[str], content_hashes: List[str], job_description: str) -> np.ndarray:
+        """Cosine similarity of each resume to the job description, clipped to 0-1"""
+        return self.score_matrix(texts, content_hashes, [job_description])[:, 0]
+
+    def score_matrix(self, texts: List[str], content_hashes: List[str],
+                     job_descriptions: List[str]) -> np.ndarray:
+        """Cosine similarities of resumes (rows) to job descriptions (columns), clipped to 0-1"""
+        queries = self.encoder.encode(list(job_descriptions))
+        return np.clip(self.embed(texts, content_hashes) @ queries.T, 0.0, 1.0)
+
+    def top_k(self, job_description: str, k: int) -> List[Tuple[str, float]]:
+        """Content hashes of the k stored resumes most similar to the job description"""
+        query = self.encoder.encode([job_description])[0]
+        hashes, scores = self.store.top_k(query, k)
+        return list(zip(hashes, np.clip(scores, 0.0, 1.0).tolist()))
@@ -1,19 +1,139 @@
+import copy
 import re
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from typing import Dict, List
+import math
+import time
+import numpy as np
+from typing import Dict, List, Optional, Tuple, Union
+from utils.config import Config
+from utils.document import ParsedDocument
+from utils.embeddings import ResumeEmbedder
+from utils.metrics import timed
+from utils.parse_cache import content_hash
+from utils.skill_engine import get_skill_engine
+
+# Smoothed IDF of a term in one of two documents; a term in both gets ln(3 / 3) + 1 = 1
+PAIR_UNIQUE_IDF = math.log(3 / 2) + 1
+
+REQUIRED_EXPERIENCE_PATTERNS = (
+    re.compile(r'(\d+)\+?\s*years?'),
+    re.compile(r'(\d+)\+?\s*yr'),
+    re.compile(r'experience.*?(\d+)')
+)
+KEYWORD_STOP_WORDS = {'this', 'that', 'with', 'have', 'from', 'they', 'what'}
+MAX_KEYWORDS = 20
+
+# Score components, each weighted by the matching Config.*_WEIGHT setting
+SCORE_COMPONENTS = ('skills', 'experience', 'semantic', 'keywords')
+
+
+def default_weights() -> Dict[str, float]:
+    """Component weights from Config"""
+    return {
+        'skills': Config.SKILLS_WEIGHT,
+        'experience': Config.EXPERIENCE_WEIGHT,
+        'semantic': Config.SEMANTIC_WEIGHT,
+        'keywords': Config.KEYWORDS_WEIGHT
+    }
+
+
+def weighted_score(skills, experience, semantic, keywords, weights: Optional[Dict[str, float]] = None):
+    """Combine component scores with weights normalized to sum to 1, on floats or arrays of any scale"""
+    weights = weights or default_weights()
+    total = sum(weights[component] for component in SCORE_COMPONENTS)
+    if total <= 0:
+        return skills * 0.0
+    return (
+        skills * weights['skills'] +
+        experience * weights['experience'] +
+        semantic * weights['semantic'] +
+        keywords * weights['keywords']
+    ) / total
+
+
+def _content_tokens(document: ParsedDocument) -> List[str]:
+    """CountVectorizer analyzer reusing a document's stop-word-filtered tokens"""
+    return document.content_tokens
+
+
+class MatchMatrix:
+    """Scores of many candidates (rows) against many job descriptions (columns), 0-100"""
+    
+    def __init__(self, candidates: List[Dict], job_descriptions: List[str], match_score: np.ndarray,
+                 skills_match: np.ndarray, experience_match: np.ndarray, semantic_match: np.ndarray,
+                 keywords_match: np.ndarray):
+        self.candidates = candidates
+        self.job_descriptions = job_descriptions
+        self.match_score = match_score
+        self.skills_match = skills_match
+        self.experience_match = experience_match
+        self.semantic_match = semantic_match
+        self.keywords_match = keywords_match
+    
+    def rescore(self, weights: Dict[str, float]):
+        """Recompute match_score from the stored components with new weights"""
+        self.match_score = weighted_score(self.skills_match, self.experience_match, self.semantic_match,
+                                          self.keywords_match, weights)
+    
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.match_score.shape
+    
+    def best_requisition_per_candidate(self) -> List[Tuple[int, float]]:
+        """(job description index, score) of each candidate's best match, in candidate order"""
+        if not self.job_descriptions:
+            return []
+        best = np.argmax(self.match_score, axis=1)
+        scores = self.match_score[np.arange(len(best)), best]
+        return list(zip(best.tolist(), scores.tolist()))
+    
+    def best_candidates_per_requisition(self, top_k: int = 10) -> List[List[Tuple[int, float]]]:
+        """For each job description, (candidate index, score) of its top_k candidates, best first"""
+        n_candidates = self.match_score.shape[0]
+        top_k = min(top_k, n_candidates)
+        if top_k <= 0:
+            return [[] for _ in self.job_descriptions]
+        
+        columns = self.match_score.T
+        # argpartition finds each column's top_k without sorting the whole column
+        top = np.argpartition(-columns, top_k - 1, axis=1)[:, :top_k]
+        top_scores = np.take_along_axis(columns, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        return [list(zip(indices.tolist(), scores.tolist())) for indices, scores in zip(top, top_scores)]
 
 class CandidateMatcher:
-    def __init__(self):
-        self.skills_db = [
-            'python', 'java', 'javascript', 'sql', 'aws', 'docker', 'kubernetes',
-            'machine learning', 'deep learning', 'react', 'angular', 'vue',
-            'node.js', 'django', 'flask', 'fastapi', 'mongodb', 'postgresql',
-            'mysql', 'redis', 'git', 'jenkins', 'ci/cd', 'agile', 'scrum',
-            'tableau', 'power bi', 'excel', 'tensorflow', 'pytorch', 'sklearn',
-            'pandas', 'numpy', 'matplotlib', 'seaborn', 'plotly'
-        ]
+    # Bump whenever scoring changes so remembered results are not reused
+    MATCHER_VERSION = '2'
+    
+    def __init__(self, semantic_mode: Optional[str] = None, embedder: Optional[ResumeEmbedder] = None,
+                 weights: Optional[Dict[str, float]] = None):
+        self.skill_engine = get_skill_engine()
+        self.skills_db = self.skill_engine.skills
+        self._skill_set = set(self.skills_db)
+        self.weights = weights or default_weights()
+        self.semantic_mode = semantic_mode or Config.SEMANTIC_MODE
+        self._embedder = embedder
+        self.last_batch_stats = {}
+    
+    @property
+    def version(self) -> str:
+        """Identifies how this matcher scores: code version and semantic mode"""
+        return f'{self.MATCHER_VERSION}-{self.semantic_mode}'
+    
+    def with_weights(self, weights: Dict[str, float]) -> 'CandidateMatcher':
+        """A copy using other weights that shares the skill engine and embedding model"""
+        matcher = copy.copy(self)
+        matcher.weights = dict(weights)
+        matcher.last_batch_stats = {}
+        return matcher
+    
+    @property
+    def embedder(self) -> ResumeEmbedder:
+        """Embedding model and vector store, created on first use in embedding mode"""
+        if self._embedder is None:
+            self._embedder = ResumeEmbedder()
+        return self._embedder
     
     def calculate_match(self, candidate_data: Dict, job_description: str) -> Dict:
         """Calculate match score between candidate and job description"""
@@ -21,48 +141,152 @@ class CandidateMatcher:
         # Calculate different match components
         skills_match = self._calculate_skills_match(candidate_data['skills'], job_description)
         experience_match = self._calculate_experience_match(candidate_data['experience'], job_description)
-        semantic_match = self._calculate_semantic_match(candidate_data['raw_text'], job_description)
+        semantic_match = float(self._calculate_semantic_matches(
+            [candidate_data['raw_text']], job_description, [candidate_data.get('content_hash')]
+        )[0])
+        keywords_match = self._keywords_overlap(candidate_data['raw_text'], self._extract_keywords(job_description))
+        
+        return self._build_result(candidate_data, skills_match, experience_match, semantic_match, keywords_match)
+    
+    @timed('matcher.calculate_matches')
+    def calculate_matches(self, candidates: List[Dict], job_description: str) -> List[Dict]:
+        """Calculate match scores for a batch of candidates against one job description, analysing it once"""
+        start = time.perf_counter()
+        
+        jd_document = ParsedDocument.of(job_description)
+        job_skills = self._extract_skills_from_jd(jd_document)
+        required_exp = self._extract_required_experience(jd_document)
+        jd_keywords = self._extract_keywords(jd_document)
+        # Tokenized once here for both TF-IDF and keywords
+        documents = [ParsedDocument.of(candidate['raw_text']) for candidate in candidates]
+        semantic_scores = self._calculate_semantic_matches(
+            documents, job_description, [candidate.get('content_hash') for candidate in candidates]
+        )
+        
+        results = []
+        for candidate, document, semantic_match in zip(candidates, documents, semantic_scores):
+            skills_match = self._skills_overlap(candidate['skills'], job_skills)
+            experience_match = self._experience_ratio(candidate['experience'], required_exp)
+            keywords_match = self._keywords_overlap(document, jd_keywords)
+            results.append(
+                self._build_result(candidate, skills_match, experience_match, float(semantic_match), keywords_match)
+            )
+        
+        elapsed = time.perf_counter() - start
+        self.last_batch_stats = {
+            'candidates': len(candidates),
+            'seconds': elapsed,
+            'candidates_per_second': len(candidates) / elapsed if elapsed > 0 else 0.0
+        }
+        return results
+    
+    @timed('matcher.calculate_match_matrix')
+    def calculate_match_matrix(self, candidates: List[Dict], job_descriptions: List[str]) -> MatchMatrix:
+        """Score every candidate against every job description; entry [i, j] equals calculate_match"""
+        start = time.perf_counter()
+        n_candidates, n_jobs = len(candidates), len(job_descriptions)
+        jd_documents = [ParsedDocument.of(jd) for jd in job_descriptions]
+        documents = [ParsedDocument.of(candidate['raw_text']) for candidate in candidates]
+        
+        skills_match = self._overlap_matrix(
+            [set(candidate['skills']) for candidate in candidates],
+            [self._extract_skills_from_jd(document) for document in jd_documents]
+        )
+        keywords_match = self._overlap_matrix(
+            [document.token_set for document in documents],
+            [self._extract_keywords(document) for document in jd_documents]
+        )
         
+        # Experience: ratio to each requirement, capped at 1; no requirement counts as a full match
+        required = np.array([self._extract_required_experience(document) for document in jd_documents])
+        experience = np.array([float(candidate['experience']) for candidate in candidates])
+        experience_match = np.ones((n_candidates, n_jobs))
+        np.divide(experience[:, None], required, out=experience_match, where=required > 0)
+        np.minimum(experience_match, 1.0, out=experience_match)
+        
+        semantic_match = self._calculate_semantic_matrix(
+            documents, job_descriptions, [candidate.get('content_hash') for candidate in candidates]
+        )
+        
+        elapsed = time.perf_counter() - start
+        self.last_batch_stats = {
+            'candidates': n_candidates,
+            'job_descriptions': n_jobs,
+            'seconds': elapsed,
+            'pairs_per_second': n_candidates * n_jobs / elapsed if elapsed > 0 else 0.0
+        }
+        return MatchMatrix(
+            candidates, list(job_descriptions),
+            match_score=weighted_score(skills_match, experience_match, semantic_match, keywords_match,
+                                       self.weights) * 100,
+            skills_match=skills_match * 100,
+            experience_match=experience_match * 100,
+            semantic_match=semantic_match * 100,
+            keywords_match=keywords_match * 100
+        )
+    
+    @staticmethod
+    def _overlap_matrix(candidate_terms: List[set], job_terms: List[List[str]]) -> np.ndarray:
+        """Fraction of each job's terms (columns) found in each candidate's terms (rows)"""
+        columns = {}
+        for terms in job_terms:
+            for term in terms:
+                columns.setdefault(term, len(columns))
+        job_matrix = np.zeros((len(job_terms), len(columns)))
+        for j, terms in enumerate(job_terms):
+            job_matrix[j, [columns[term] for term in terms]] = 1.0
+        candidate_matrix = np.zeros((len(candidate_terms), len(columns)))
+        for i, terms in enumerate(candidate_terms):
+            candidate_matrix[i, [column for term, column in columns.items() if term in terms]] = 1.0
+        
+        job_counts = job_matrix.sum(axis=1)
+        overlap = np.zeros((len(candidate_terms), len(job_terms)))
+        np.divide(candidate_matrix @ job_matrix.T, job_counts, out=overlap, where=job_counts > 0)
+        return overlap
+    
+    def _build_result(self, candidate_data: Dict, skills_match: float, experience_match: float,
+                      semantic_match: float, keywords_match: float) -> Dict:
+        """Combine component scores into the result dict"""
         # Weighted final score
-        final_score = (
-            skills_match * 0.5 +
-            experience_match * 0.3 +
-            semantic_match * 0.2
-        ) * 100
+        final_score = weighted_score(skills_match, experience_match, semantic_match, keywords_match,
+                                     self.weights) * 100
         
         return {
             **candidate_data,
             'match_score': final_score,
             'skills_match': skills_match * 100,
             'experience_match': experience_match * 100,
-            'semantic_match': semantic_match * 100
+            'semantic_match': semantic_match * 100,
+            'keywords_match': keywords_match * 100
         }
     
     def _calculate_skills_match(self, candidate_skills: List[str], job_description: str) -> float:
         """Calculate skills match percentage"""
         job_skills = self._extract_skills_from_jd(job_description)
-        
+        return self._skills_overlap(candidate_skills, job_skills)
+    
+    @timed('matcher.skills_match')
+    def _skills_overlap(self, candidate_skills: List[str], job_skills: List[str]) -> float:
+        """Fraction of the job's skills the candidate has"""
         if not job_skills:
             return 0.0
         
         matched_skills = set(candidate_skills) & set(job_skills)
-        return len(matched_skills) / len(job_skills) if job_skills else 0.0
+        return len(matched_skills) / len(job_skills)
     
-    def _extract_skills_from_jd(self, job_description: str) -> List[str]:
+    @timed('matcher.extract_jd_skills')
+    def _extract_skills_from_jd(self, job_description: Union[str, ParsedDocument]) -> List[str]:
         """Extract skills from job description"""
-        found_skills = []
-        jd_lower = job_description.lower()
-        
-        for skill in self.skills_db:
-            if skill in jd_lower:
-                found_skills.append(skill)
-        
-        return found_skills
+        return self.skill_engine.extract(job_description)
     
     def _calculate_experience_match(self, candidate_experience: float, job_description: str) -> float:
         """Calculate experience match"""
         required_exp = self._extract_required_experience(job_description)
-        
+        return self._experience_ratio(candidate_experience, required_exp)
+    
+    @timed('matcher.experience_match')
+    def _experience_ratio(self, candidate_experience: float, required_exp: float) -> float:
+        """Ratio of candidate experience to the requirement, capped at 1"""
         if required_exp == 0:
             return 1.0  # No experience requirement specified
         
@@ -71,45 +295,114 @@ class CandidateMatcher:
         else:
             return candidate_experience / required_exp
     
-    def _extract_required_experience(self, job_description: str) -> float:
+    @timed('matcher.extract_required_experience')
+    def _extract_required_experience(self, job_description: Union[str, ParsedDocument]) -> float:
         """Extract required years of experience from job description"""
-        patterns = [
-            r'(\d+)\+?\s*years?',
-            r'(\d+)\+?\s*yr',
-            r'experience.*?(\d+)'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, job_description.lower())
-            if matches:
-                return float(matches[0])
+        jd_lower = ParsedDocument.of(job_description).lower
+        for pattern in REQUIRED_EXPERIENCE_PATTERNS:
+            match = pattern.search(jd_lower)
+            if match:
+                return float(match.group(1))
         
         return 0.0
     
     def _calculate_semantic_match(self, resume_text: str, job_description: str) -> float:
-        """Calculate semantic similarity using TF-IDF and cosine similarity"""
-        # Combine texts
-        documents = [resume_text, job_description]
+        """Calculate semantic similarity of one resume to the job description"""
+        return float(self._calculate_semantic_matches([resume_text], job_description)[0])
+    
+    @timed('matcher.semantic_match')
+    def _calculate_semantic_matches(self, resume_texts: List[Union[str, ParsedDocument]], job_description: str,
+                                    content_hashes: Optional[List[str]] = None) -> np.ndarray:
+        """Semantic similarity of many resumes to one job description, per semantic_mode"""
+        return self._calculate_semantic_matrix(resume_texts, [job_description], content_hashes)[:, 0]
+    
+    def _calculate_semantic_matrix(self, resume_texts: List[Union[str, ParsedDocument]],
+                                   job_descriptions: List[str],
+                                   content_hashes: Optional[List[str]] = None) -> np.ndarray:
+        """Semantic similarity of many resumes (rows) to many job descriptions (columns)"""
+        if self.semantic_mode == 'embedding':
+            # Embeddings are stored per content hash; fall back to hashing the text
+            texts = [ParsedDocument.of(text).text for text in resume_texts]
+            content_hashes = content_hashes or [None] * len(texts)
+            content_hashes = [
+                key or content_hash(text.encode('utf-8')) for text, key in zip(texts, content_hashes)
+            ]
+            return self.embedder.score_matrix(texts, content_hashes, job_descriptions)
+        return self._calculate_tfidf_matrix(resume_texts, job_descriptions)
+    
+    def rank_by_embedding(self, job_description: str, top_k: int = 50) -> List[Tuple[str, float]]:
+        """Content hashes and similarities of the stored resumes closest to a job description"""
+        return self.embedder.top_k(job_description, top_k)
+    
+    def _calculate_tfidf_matches(self, resume_texts: List[Union[str, ParsedDocument]],
+                                 job_description: Union[str, ParsedDocument]) -> np.ndarray:
+        """Calculate TF-IDF cosine similarity of many resumes to one job description"""
+        return self._calculate_tfidf_matrix(resume_texts, [job_description])[:, 0]
+    
+    def _calculate_tfidf_matrix(self, resume_texts: List[Union[str, ParsedDocument]],
+                                job_descriptions: List[Union[str, ParsedDocument]]) -> np.ndarray:
+        """TF-IDF cosine similarity of every resume (rows) to every job description (columns).
         
-        # Create TF-IDF vectorizer
-        vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
+        Each score equals fitting a TfidfVectorizer on the (resume, job description)
+        pair alone, computed for all pairs at once with sparse products.
+        """
+        scores = np.zeros((len(resume_texts), len(job_descriptions)))
+        if not resume_texts or not job_descriptions:
+            return scores
         
+        # Imported lazily, as in ParsedDocument.content_tokens
+        from sklearn.feature_extraction.text import CountVectorizer
+        
+        documents = ([ParsedDocument.of(jd) for jd in job_descriptions] +
+                     [ParsedDocument.of(text) for text in resume_texts])
+        vectorizer = CountVectorizer(analyzer=_content_tokens)
         try:
-            # Transform documents to TF-IDF features
-            tfidf_matrix = vectorizer.fit_transform(documents)
-            
-            # Calculate cosine similarity
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])
-            return similarity[0][0]
-        except:
-            return 0.0
+            counts = vectorizer.fit_transform(documents).tocsr().astype(np.float64)
+        except ValueError:
+            # Empty vocabulary: nothing but stop words or no text at all
+            return scores
+        
+        jd_counts = counts[:len(job_descriptions)]
+        resume_counts = counts[len(job_descriptions):]
+        jd_present = (jd_counts > 0).astype(np.float64)
+        resume_present = (resume_counts > 0).astype(np.float64)
+        unique_weight = PAIR_UNIQUE_IDF ** 2
+        
+        # Dot products only involve shared terms, whose IDF is 1
+        dot = (resume_counts @ jd_counts.T).toarray()
+        
+        # Squared norms split into shared terms (IDF 1) and unshared terms
+        resume_sq = resume_counts.multiply(resume_counts)
+        resume_sq_total = np.asarray(resume_sq.sum(axis=1))
+        resume_sq_shared = (resume_sq @ jd_present.T).toarray()
+        resume_norm_sq = resume_sq_shared + unique_weight * (resume_sq_total - resume_sq_shared)
+        
+        jd_sq = jd_counts.multiply(jd_counts)
+        jd_sq_total = np.asarray(jd_sq.sum(axis=1)).T
+        jd_sq_shared = (resume_present @ jd_sq.T).toarray()
+        jd_norm_sq = jd_sq_shared + unique_weight * (jd_sq_total - jd_sq_shared)
+        
+        denominator = np.sqrt(resume_norm_sq * jd_norm_sq)
+        np.divide(dot, denominator, out=scores, where=denominator > 0)
+        return scores
     
-    def _extract_keywords(self, text: str) -> List[str]:
-        """Extract important keywords from text"""
-        words = re.findall(r'\b[a-zA-Z]{4,}\b', text.lower())
+    @timed('matcher.extract_keywords')
+    def _extract_keywords(self, text: Union[str, ParsedDocument]) -> List[str]:
+        """Extract important keywords from text, in order of first mention"""
+        # Words of four or more ASCII letters, taken from the shared tokens
+        words = [token for token in ParsedDocument.of(text).tokens
+                 if len(token) >= 4 and token.isascii() and token.isalpha()]
         
         # Filter out common words and focus on meaningful terms
-        stop_words = {'this', 'that', 'with', 'have', 'from', 'they', 'what'}
-        keywords = [word for word in words if word not in stop_words and word not in self.skills_db]
+        keywords = [word for word in words if word not in KEYWORD_STOP_WORDS and word not in self._skill_set]
+        
+        return list(dict.fromkeys(keywords))[:MAX_KEYWORDS]
+    
+    @timed('matcher.keywords_match')
+    def _keywords_overlap(self, resume_text: Union[str, ParsedDocument], jd_keywords: List[str]) -> float:
+        """Fraction of the job description's keywords that appear in the resume"""
+        if not jd_keywords:
+            return 0.0
         
-        return list(set(keywords))[:20]
+        resume_words = ParsedDocument.of(resume_text).token_set
+        return sum(1 for keyword in jd_keywords if keyword in resume_words) / len(jd_keywords)
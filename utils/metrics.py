@@ -0,0 +1,129 @@
+import functools
+import threading
+import time
+from typing import Callable, Dict, List
+
+from utils.config import Config
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+
+class StageMetrics:
+    """Call count, total and maximum time, and a latency histogram for one stage"""
+
+    __slots__ = ('count', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)  # last slot counts values above every bound
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def merge(self, other: Dict):
+        self.count += other['count']
+        self.total += other['total']
+        self.max = max(self.max, other['max'])
+        for i, value in enumerate(other['buckets']):
+            self.buckets[i] += value
+
+    def to_dict(self) -> Dict:
+        return {'count': self.count, 'total': self.total, 'max': self.max, 'buckets': list(self.buckets)}
+
+
+class Metrics:
+    """Registry of per-stage timings for the parse/match pipeline, off unless Config.METRICS_ENABLED"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._stages: Dict[str, StageMetrics] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            metrics = self._stages.get(stage)
+            if metrics is None:
+                metrics = self._stages[stage] = StageMetrics()
+            metrics.observe(seconds)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Raw per-stage data: count, total and max seconds, and bucket counts"""
+        with self._lock:
+            return {stage: metrics.to_dict() for stage, metrics in self._stages.items()}
+
+    def drain(self) -> Dict[str, Dict]:
+        """Snapshot and reset, for shipping a worker's timings to the main process"""
+        with self._lock:
+            data = {stage: metrics.to_dict() for stage, metrics in self._stages.items()}
+            self._stages.clear()
+        return data
+
+    def merge(self, data: Dict[str, Dict]):
+        """Add timings collected elsewhere, e.g. in a worker process"""
+        with self._lock:
+            for stage, values in data.items():
+                self._stages.setdefault(stage, StageMetrics()).merge(values)
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+    def summary(self) -> List[Dict]:
+        """One row per stage with totals and mean, slowest stages first"""
+        rows = []
+        for stage, data in self.snapshot().items():
+            rows.append({
+                'stage': stage,
+                'count': data['count'],
+                'total_seconds': data['total'],
+                'mean_ms': data['total'] / data['count'] * 1000 if data['count'] else 0.0,
+                'max_ms': data['max'] * 1000
+            })
+        return sorted(rows, key=lambda row: row['total_seconds'], reverse=True)
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format, as a histogram labelled by stage"""
+        name = 'recruitment_stage_duration_seconds'
+        lines = [
+            f'# HELP {name} Time spent in each resume parsing and matching stage.',
+            f'# TYPE {name} histogram'
+        ]
+        for stage, data in sorted(self.snapshot().items()):
+            cumulative = 0
+            for bound, count in zip(BUCKETS, data['buckets']):
+                cumulative += count
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound:g}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {data["count"]}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {data["total"]:.9f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {data["count"]}')
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics(enabled=Config.METRICS_ENABLED)
+
+
+def timed(stage: str) -> Callable:
+    """Decorator recording each call's duration under stage while metrics are enabled"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                metrics.record(stage, time.perf_counter() - start)
+        return wrapper
+    return decorator
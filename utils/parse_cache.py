@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional, Union
+
+from utils.config import Config
+
+
+def content_hash(data: Union[bytes, bytearray, memoryview]) -> str:
+    """SHA-256 hex digest identifying a file by its content"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ParseCache:
+    """On-disk LRU cache of parsed resumes keyed by content hash and parser version"""
+
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None,
+                 parser_version: str = ''):
+        self.path = path or Config.PARSE_CACHE_PATH
+        self.max_bytes = max_bytes or Config.PARSE_CACHE_MAX_BYTES
+        self.parser_version = parser_version
+        self._lock = threading.Lock()
+
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Streamlit runs each session on its own thread; access is serialized by _lock
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS parse_cache (
+                    content_hash TEXT NOT NULL,
+                    parser_version TEXT NOT NULL,
+                    payload BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (content_hash, parser_version)
+                )
+            """)
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_parse_cache_last_used ON parse_cache (last_used)')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS cache_stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+            for name in ('hits', 'misses', 'evictions'):
+                self._conn.execute('INSERT OR IGNORE INTO cache_stats (name, value) VALUES (?, 0)', (name,))
+
+        self._total_bytes = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM parse_cache').fetchone()[0]
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached parse for a content hash, or None"""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                'SELECT payload FROM parse_cache WHERE content_hash = ? AND parser_version = ?',
+                (key, self.parser_version)
+            ).fetchone()
+
+            if row is None:
+                self._bump('misses')
+                return None
+
+            self._conn.execute(
+                'UPDATE parse_cache SET last_used = ? WHERE content_hash = ? AND parser_version = ?',
+                (time.time(), key, self.parser_version)
+            )
+            self._bump('hits')
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, key: str, parsed: Dict):
+        """Store a parsed resume, evicting old entries if over the size limit"""
+        payload = zlib.compress(json.dumps(parsed).encode('utf-8'))
+
+        with self._lock, self._conn:
+            previous = self._conn.execute(
+                'SELECT size FROM parse_cache WHERE content_hash = ? AND parser_version = ?',
+                (key, self.parser_version)
+            ).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO parse_cache VALUES (?, ?, ?, ?, ?)',
+                (key, self.parser_version, payload, len(payload), time.time())
+            )
+            self._total_bytes += len(payload) - (previous[0] if previous else 0)
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                'SELECT content_hash, parser_version, size FROM parse_cache ORDER BY last_used LIMIT 64'
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                break
+
+            evicted = 0
+            for key, version, size in rows:
+                self._conn.execute(
+                    'DELETE FROM parse_cache WHERE content_hash = ? AND parser_version = ?',
+                    (key, version)
+                )
+                self._total_bytes -= size
+                evicted += 1
+                if self._total_bytes <= self.max_bytes:
+                    break
+            self._bump('evictions', evicted)
+
+    def _bump(self, name: str, amount: int = 1):
+        self._conn.execute('UPDATE cache_stats SET value = value + ? WHERE name = ?', (amount, name))
+
+    def stats(self) -> Dict:
+        """Counters and size information for display"""
+        with self._lock:
+            counters = dict(self._conn.execute('SELECT name, value FROM cache_stats').fetchall())
+            entries = self._conn.execute('SELECT COUNT(*) FROM parse_cache').fetchone()[0]
+
+        lookups = counters['hits'] + counters['misses']
+        return {
+            **counters,
+            'hit_rate': counters['hits'] / lookups if lookups else 0.0,
+            'entries': entries,
+            'bytes': self._total_bytes,
+            'max_bytes': self.max_bytes
+        }
+
+    def clear(self):
+        """Remove all entries and reset the counters"""
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM parse_cache')
+            self._conn.execute('UPDATE cache_stats SET value = 0')
+            self._total_bytes = 0
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,91 @@
+import time
+from typing import Dict, List, Optional
+
+from utils.config import Config
+from utils.matcher import CandidateMatcher
+from utils.skill_index import SkillIndex
+
+
+class RetrieveRerankPipeline:
+    """Two-stage matching: a SkillIndex shortlists the top N candidates and CandidateMatcher reranks them"""
+
+    def __init__(self, matcher: Optional[CandidateMatcher] = None, top_n: Optional[int] = None):
+        self.matcher = matcher or CandidateMatcher()
+        self.top_n = top_n or Config.RERANK_TOP_N
+        self.last_stats = {}
+
+    def run(self, candidates: List[Dict], job_description: str, top_n: Optional[int] = None,
+            measure_recall: bool = False, recall_k: int = 10) -> List[Dict]:
+        """Match parsed resumes against a job description, best first, with results shaped like calculate_match"""
+        top_n = top_n or self.top_n
+        start = time.perf_counter()
+        selected = self._retrieve(candidates, job_description, top_n)
+        retrieved = time.perf_counter()
+
+        scored = self.matcher.calculate_matches([candidates[i] for i in selected], job_description)
+        order = sorted(range(len(scored)), key=lambda i: scored[i]['match_score'], reverse=True)
+        finished = time.perf_counter()
+
+        self._record_stats(len(candidates), top_n, len(scored), start, retrieved, finished)
+        if measure_recall:
+            self._measure_recall(candidates, job_description, [selected[i] for i in order], recall_k)
+        return [scored[i] for i in order]
+
+    def run_pool(self, pool, job_description: str, top_n: Optional[int] = None,
+                 query: Optional[str] = None) -> List[Dict]:
+        """Match a stored CandidatePool, loading and rescoring only the shortlisted candidates"""
+        top_n = top_n or self.top_n
+        start = time.perf_counter()
+        job_skills = self.matcher.skill_engine.extract(job_description)
+        ranked = pool.skill_index.rank(job_skills, query=query, top_k=top_n)
+        shortlisted = pool.get_candidates([candidate_id for candidate_id, _ in ranked])
+        retrieved = time.perf_counter()
+
+        results = self.matcher.calculate_matches(
+            [candidate.to_parsed_dict() for candidate in shortlisted], job_description
+        )
+        results.sort(key=lambda result: result['match_score'], reverse=True)
+        finished = time.perf_counter()
+
+        self._record_stats(len(pool.skill_index), top_n, len(results), start, retrieved, finished)
+        return results
+
+    def _record_stats(self, candidates: int, top_n: int, reranked: int,
+                      start: float, retrieved: float, finished: float):
+        self.last_stats = {
+            'candidates': candidates,
+            'top_n': top_n,
+            'reranked': reranked,
+            'retrieve_seconds': retrieved - start,
+            'rerank_seconds': finished - retrieved,
+            'total_seconds': finished - start
+        }
+
+    def _retrieve(self, candidates: List[Dict], job_description: str, top_n: int) -> List[int]:
+        """Positions of the top_n candidates by skill overlap with the job"""
+        job_skills = self.matcher.skill_engine.extract(job_description)
+        # Without any known skills in the job there is nothing to narrow on
+        if len(candidates) <= top_n or not job_skills:
+            return list(range(len(candidates)))
+
+        index = SkillIndex(self.matcher.skill_engine)
+        for position, candidate in enumerate(candidates):
+            index.add(position, candidate['skills'])
+        return [position for position, _ in index.rank(job_skills, top_k=top_n)]
+
+    def _measure_recall(self, candidates: List[Dict], job_description: str, ranked: List[int], recall_k: int):
+        """Compare the pipeline's top recall_k with that of scoring every candidate"""
+        start = time.perf_counter()
+        full = self.matcher.calculate_matches(candidates, job_description)
+        full_seconds = time.perf_counter() - start
+
+        true_top = set(sorted(range(len(full)), key=lambda i: full[i]['match_score'], reverse=True)[:recall_k])
+        returned_top = set(ranked[:recall_k])
+        total_seconds = self.last_stats['total_seconds']
+
+        self.last_stats.update({
+            'recall_k': recall_k,
+            'recall': len(true_top & returned_top) / len(true_top) if true_top else 1.0,
+            'full_seconds': full_seconds,
+            'speedup': full_seconds / total_seconds if total_seconds > 0 else None
+        })
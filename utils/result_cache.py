@@ -0,0 +1,54 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from utils.config import Config
+
+
+def result_key(job_description: str, files: Iterable[Tuple[str, str]], weights: Dict[str, float],
+               version: str) -> str:
+    """Key identifying one matching run; the order of files does not matter"""
+    digest = hashlib.sha256()
+    digest.update(job_description.encode('utf-8'))
+    for file_hash, filename in sorted(files):
+        digest.update(f'\0{file_hash}\0{filename}'.encode('utf-8'))
+    for component, weight in sorted(weights.items()):
+        digest.update(f'\0{component}={weight!r}'.encode('utf-8'))
+    digest.update(f'\0{version}'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Bounded in-memory LRU of matching results, shared by all sessions; values are read-only"""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or Config.RESULT_CACHE_ENTRIES
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
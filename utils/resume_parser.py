@@ -1,137 +1,263 @@
+import io
+import os
 import re
-from PyPDF2 import PdfReader
-from docx import Document
-from typing import Dict, List
+from typing import BinaryIO, Dict, List, Optional, Union
+from utils.config import Config
+from utils.document import ParsedDocument
+from utils.metrics import timed
+from utils.parse_cache import ParseCache, content_hash
+from utils.skill_engine import get_skill_engine
+
+# Compiled once at import; each is applied to every resume
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+NAME_LINE_PATTERN = re.compile(r'^[A-Za-z]{2,}(?:\s+[A-Za-z]{2,}){1,2}$')
+EXPERIENCE_PATTERNS = (
+    re.compile(r'(\d+)\s*years?'),
+    re.compile(r'(\d+)\s*yr'),
+    re.compile(r'experience.*?(\d+)')
+)
+NAME_KEYWORDS = ('name:', 'full name:', 'candidate:')
+EDUCATION_KEYWORDS = (
+    'bachelor', 'master', 'phd', 'mba', 'bs', 'ms', 'ba', 'ma',
+    'university', 'college', 'degree', 'graduated'
+)
+
+TextLike = Union[str, ParsedDocument]
+
+
+def oversize_message(size: int) -> Optional[str]:
+    """Why a file of this many bytes is refused, or None if it is within Config.MAX_FILE_SIZE"""
+    if size <= Config.MAX_FILE_SIZE:
+        return None
+    return (f"File is {size / (1024 * 1024):.1f} MB; "
+            f"the limit is {Config.MAX_FILE_SIZE / (1024 * 1024):.0f} MB")
+
+
+def error_result(message: str, filename: str = '', key: str = '') -> Dict:
+    """Result for a resume that could not be processed; its scores are zero so it ranks last"""
+    return {
+        'name': 'Candidate',
+        'email': 'N/A',
+        'phone': 'N/A',
+        'skills': [],
+        'experience': 0.0,
+        'education': 'N/A',
+        'raw_text': f'Error: {message}',
+        'filename': filename,
+        'content_hash': key,
+        'warnings': [message],
+        'error': message,
+        'match_score': 0.0,
+        'skills_match': 0.0,
+        'experience_match': 0.0,
+        'semantic_match': 0.0,
+        'keywords_match': 0.0
+    }
+
 
 class ResumeParser:
-    def __init__(self):
-        self.skills_db = [
-            'python', 'java', 'javascript', 'sql', 'aws', 'docker', 'kubernetes',
-            'machine learning', 'deep learning', 'react', 'angular', 'vue',
-            'node.js', 'django', 'flask', 'fastapi', 'mongodb', 'postgresql',
-            'mysql', 'redis', 'git', 'jenkins', 'ci/cd', 'agile', 'scrum',
-            'tableau', 'power bi', 'excel', 'tensorflow', 'pytorch', 'sklearn',
-            'pandas', 'numpy', 'matplotlib', 'seaborn', 'plotly'
-        ]
+    # Bump whenever extraction or field parsing changes so cached parses are not reused
+    PARSER_VERSION = '3'
+    
+    # Keys of a parsed resume, as stored in the parse cache
+    PARSED_FIELDS = ('name', 'email', 'phone', 'skills', 'experience', 'education', 'raw_text',
+                     'content_hash', 'warnings')
+    
+    @classmethod
+    def version(cls) -> str:
+        """Stamp for the parse cache: code version, skills taxonomy and extraction limits"""
+        return (f'{cls.PARSER_VERSION}/skills-{get_skill_engine().fingerprint}'
+                f'/pages-{Config.MAX_PDF_PAGES}/chars-{Config.MAX_TEXT_CHARS}')
+    
+    def __init__(self, cache: Optional[ParseCache] = None):
+        self.cache = cache
+        self.skill_engine = get_skill_engine()
+        self.skills_db = self.skill_engine.skills
     
     def parse_resume(self, file_path: str) -> Dict:
         """Parse resume file and extract structured information"""
         try:
-            text = self._extract_text(file_path)
-            
-            return {
-                'name': self._extract_name_simple(text),
-                'email': self._extract_email(text),
-                'phone': self._extract_phone(text),
-                'skills': self._extract_skills(text),
-                'experience': self._extract_experience(text),
-                'education': self._extract_education_simple(text),
-                'raw_text': text
-            }
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            return error_result(f"Could not read file: {e}", os.path.basename(file_path))
+        
+        return self.parse_resume_bytes(data, os.path.basename(file_path))
+    
+    def parse_resume_bytes(self, data: Union[bytes, bytearray, memoryview, BinaryIO], filename: str) -> Dict:
+        """Parse resume content held in memory; the filename selects the format"""
+        if hasattr(data, 'read'):
+            data = data.read()
+        
+        key = content_hash(data)
+        cached = self.get_cached(key)
+        if cached is not None:
+            return cached
+        
+        message = oversize_message(len(data))
+        if message is not None:
+            return error_result(message, filename, key)
+        
+        try:
+            warnings = []
+            text = self._extract_text(data, filename, warnings)
+            parsed = self._parse_text(text)
+        except ImportError:
+            raise
         except Exception as e:
-            return {
-                'name': 'Candidate',
-                'email': 'N/A',
-                'phone': 'N/A',
-                'skills': [],
-                'experience': 0.0,
-                'education': 'N/A',
-                'raw_text': f'Error: {str(e)}'
-            }
-    
-    def _extract_text(self, file_path: str) -> str:
-        """Extract text from different file formats"""
+            return error_result(str(e), filename, key)
+        
+        parsed['content_hash'] = key
+        parsed['warnings'] = warnings
+        self.store_cached(parsed)
+        return parsed
+    
+    def get_cached(self, key: str) -> Optional[Dict]:
+        """Return a previously parsed resume for a content hash, if cached"""
+        if self.cache is None:
+            return None
+        return self.cache.get(key)
+    
+    def store_cached(self, parsed: Dict):
+        """Cache the parsed fields of a resume, skipping failed parses"""
+        if self.cache is None or 'error' in parsed:
+            return
+        self.cache.put(parsed['content_hash'], {field: parsed[field] for field in self.PARSED_FIELDS})
+    
+    def _parse_text(self, text: str) -> Dict:
+        """Extract structured fields from resume text"""
+        document = ParsedDocument.of(text)
+        return {
+            'name': self._extract_name_simple(document),
+            'email': self._extract_email(document),
+            'phone': self._extract_phone(document),
+            'skills': self._extract_skills(document),
+            'experience': self._extract_experience(document),
+            'education': self._extract_education_simple(document),
+            'raw_text': text,
+            'warnings': []
+        }
+    
+    @timed('parser.extract_text')
+    def _extract_text(self, data: Union[bytes, bytearray, memoryview], filename: str,
+                      warnings: Optional[List[str]] = None) -> str:
+        """Extract text from different file formats, capped at Config.MAX_TEXT_CHARS"""
+        if warnings is None:
+            warnings = []
         try:
-            if file_path.lower().endswith('.pdf'):
-                return self._extract_from_pdf(file_path)
-            elif file_path.lower().endswith('.docx'):
-                return self._extract_from_docx(file_path)
+            stream = io.BytesIO(data)
+            if filename.lower().endswith('.pdf'):
+                return self._extract_from_pdf(stream, warnings)
+            elif filename.lower().endswith('.docx'):
+                return self._extract_from_docx(stream, warnings)
             else:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    return f.read()
-        except:
-            return "Could not read file"
-    
-    def _extract_from_pdf(self, file_path: str) -> str:
-        """Extract text from PDF file"""
-        text = ""
-        try:
-            with open(file_path, 'rb') as f:
-                reader = PdfReader(f)
-                for page in reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            return text
-        except:
-            return "PDF read error"
+                return self._truncate(stream.read().decode('utf-8'), warnings)
+        except ImportError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Could not read {filename}: {e}") from e
     
-    def _extract_from_docx(self, file_path: str) -> str:
-        """Extract text from DOCX file"""
-        try:
-            doc = Document(file_path)
-            return "\n".join([paragraph.text for paragraph in doc.paragraphs if paragraph.text])
-        except:
-            return "DOCX read error"
+    @timed('parser.extract_from_pdf')
+    def _extract_from_pdf(self, stream: BinaryIO, warnings: Optional[List[str]] = None) -> str:
+        """Extract text from PDF file page by page, within the page and character limits"""
+        if warnings is None:
+            warnings = []
+        # Imported on first use; _extract_text passes an ImportError on rather than blame the file
+        from PyPDF2 import PdfReader
+        parts = []
+        chars = 0
+        reader = PdfReader(stream)
+        page_count = len(reader.pages)
+        # Pages are decoded lazily as they are accessed, so stopping early saves the rest
+        for page_number, page in enumerate(reader.pages):
+            if page_number >= Config.MAX_PDF_PAGES:
+                warnings.append(f"Only the first {Config.MAX_PDF_PAGES} of {page_count} pages were read")
+                break
+            page_text = page.extract_text()
+            if page_text:
+                parts.append(page_text)
+                parts.append("\n")
+                chars += len(page_text) + 1
+                if chars >= Config.MAX_TEXT_CHARS:
+                    break
+        return self._truncate("".join(parts), warnings)
+    
+    @timed('parser.extract_from_docx')
+    def _extract_from_docx(self, stream: BinaryIO, warnings: Optional[List[str]] = None) -> str:
+        """Extract text from DOCX file, within the character limit"""
+        if warnings is None:
+            warnings = []
+        from docx import Document
+        parts = []
+        chars = 0
+        doc = Document(stream)
+        for paragraph in doc.paragraphs:
+            if paragraph.text:
+                parts.append(paragraph.text)
+                chars += len(paragraph.text) + 1
+                if chars >= Config.MAX_TEXT_CHARS:
+                    break
+        return self._truncate("\n".join(parts), warnings)
+    
+    def _truncate(self, text: str, warnings: List[str]) -> str:
+        """Cut text to Config.MAX_TEXT_CHARS, noting it in warnings"""
+        if len(text) <= Config.MAX_TEXT_CHARS:
+            return text
+        warnings.append(f"Text was truncated to the first {Config.MAX_TEXT_CHARS} characters")
+        return text[:Config.MAX_TEXT_CHARS]
     
-    def _extract_name_simple(self, text: str) -> str:
+    @timed('parser.extract_name')
+    def _extract_name_simple(self, text: TextLike) -> str:
         """Simple name extraction without spaCy"""
+        document = ParsedDocument.of(text)
         # Look for patterns like "Name: John Doe" or email prefixes
-        lines = text.split('\n')
-        for line in lines[:10]:  # Check first 10 lines
+        for line in document.lines[:10]:  # Check first 10 lines
             line = line.strip()
-            if any(keyword in line.lower() for keyword in ['name:', 'full name:', 'candidate:']):
+            line_lower = line.lower()
+            if any(keyword in line_lower for keyword in NAME_KEYWORDS):
                 # Extract name after the keyword
                 name_part = line.split(':', 1)[-1].strip()
                 if name_part and len(name_part) > 2:
                     return name_part
             
             # If line looks like a name (2-3 words, no special chars)
-            if re.match(r'^[A-Za-z]{2,}(?:\s+[A-Za-z]{2,}){1,2}$', line):
+            if NAME_LINE_PATTERN.match(line):
                 return line
         
         # Fallback: use email username
-        email = self._extract_email(text)
+        email = self._extract_email(document)
         if email != "No email found":
             username = email.split('@')[0]
             return username.replace('.', ' ').title()
         
         return "Candidate"
     
-    def _extract_email(self, text: str) -> str:
+    @timed('parser.extract_email')
+    def _extract_email(self, text: TextLike) -> str:
         """Extract email address"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        match = re.search(email_pattern, text)
+        match = EMAIL_PATTERN.search(ParsedDocument.of(text).text)
         return match.group() if match else "No email found"
     
-    def _extract_phone(self, text: str) -> str:
+    @timed('parser.extract_phone')
+    def _extract_phone(self, text: TextLike) -> str:
         """Extract phone number"""
-        phone_pattern = r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        match = re.search(phone_pattern, text)
+        match = PHONE_PATTERN.search(ParsedDocument.of(text).text)
         return match.group() if match else "No phone found"
     
-    def _extract_skills(self, text: str) -> List[str]:
+    @timed('parser.extract_skills')
+    def _extract_skills(self, text: TextLike) -> List[str]:
         """Extract skills from text"""
-        found_skills = []
-        text_lower = text.lower()
-        
-        for skill in self.skills_db:
-            if skill in text_lower:
-                found_skills.append(skill)
-        
-        return found_skills
+        return self.skill_engine.extract(text)
     
-    def _extract_experience(self, text: str) -> float:
+    @timed('parser.extract_experience')
+    def _extract_experience(self, text: TextLike) -> float:
         """Extract years of experience"""
-        patterns = [
-            r'(\d+)\s*years?',
-            r'(\d+)\s*yr',
-            r'experience.*?(\d+)'
-        ]
+        text_lower = ParsedDocument.of(text).lower
         
         max_exp = 0.0
-        for pattern in patterns:
-            matches = re.findall(pattern, text.lower())
+        for pattern in EXPERIENCE_PATTERNS:
+            matches = pattern.findall(text_lower)
             for match in matches:
                 exp = float(match)
                 if exp > max_exp:
@@ -139,17 +265,13 @@ class ResumeParser:
         
         return max_exp
     
-    def _extract_education_simple(self, text: str) -> str:
+    @timed('parser.extract_education')
+    def _extract_education_simple(self, text: TextLike) -> str:
         """Simple education extraction without spaCy"""
-        education_keywords = [
-            'bachelor', 'master', 'phd', 'mba', 'bs', 'ms', 'ba', 'ma',
-            'university', 'college', 'degree', 'graduated'
-        ]
-        
-        lines = text.split('\n')
-        for line in lines:
+        document = ParsedDocument.of(text)
+        for line in document.lines:
             line_lower = line.lower()
-            if any(keyword in line_lower for keyword in education_keywords):
+            if any(keyword in line_lower for keyword in EDUCATION_KEYWORDS):
                 return line.strip()[:80]  # Limit length
         
         return "Education not specified"
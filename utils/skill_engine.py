@@ -0,0 +1,92 @@
+import hashlib
+import json
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Union
+
+from utils.config import Config
+from utils.document import ParsedDocument
+
+# Characters that may not touch a skill mention, so "git" misses "digital" and "c" misses "c++"
+_LEFT_BOUNDARY = r'(?<![a-z0-9_])'
+_RIGHT_BOUNDARY = r'(?![a-z0-9_+#])'
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _normalize(term: str) -> str:
+    """Lowercase a term and collapse internal whitespace"""
+    return _WHITESPACE.sub(' ', term.strip().lower())
+
+
+def _build_trie(terms: List[str]) -> Dict:
+    """Build a character trie; the empty-string key marks the end of a term"""
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = True
+    return trie
+
+
+def _trie_to_pattern(node: Dict) -> str:
+    """Turn a trie into a regex with shared prefixes factored out"""
+    optional = '' in node
+    branches = []
+    for char in sorted(key for key in node if key):
+        # A space in a skill name matches any run of whitespace in the text
+        prefix = r'\s+' if char == ' ' else re.escape(char)
+        branches.append(prefix + _trie_to_pattern(node[char]))
+
+    if not branches:
+        return ''
+    if len(branches) == 1 and not optional:
+        return branches[0]
+
+    pattern = '(?:' + '|'.join(branches) + ')'
+    return pattern + '?' if optional else pattern
+
+
+class SkillEngine:
+    """Precompiled matcher mapping skill mentions in text to canonical skills"""
+
+    def __init__(self, taxonomy: Dict[str, List[str]]):
+        # Identifies the taxonomy's content, whether or not its "version" was bumped
+        self.fingerprint = hashlib.sha256(json.dumps(taxonomy, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+        self.skills = []
+        self.aliases = {}
+        for skill, aliases in taxonomy.items():
+            canonical = _normalize(skill)
+            self.skills.append(canonical)
+            for term in [skill] + list(aliases):
+                self.aliases.setdefault(_normalize(term), canonical)
+
+        trie = _build_trie(self.aliases.keys())
+        self.pattern = re.compile(_LEFT_BOUNDARY + '(' + _trie_to_pattern(trie) + ')' + _RIGHT_BOUNDARY)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'SkillEngine':
+        """Load a taxonomy JSON file of the form {"skills": {skill: [aliases]}}"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data['skills'])
+
+    def canonical(self, term: str) -> str:
+        """Map a skill name or alias to its canonical form; unknown terms are normalized"""
+        normalized = _normalize(term)
+        return self.aliases.get(normalized, normalized)
+
+    def extract(self, text: Union[str, ParsedDocument]) -> List[str]:
+        """Return canonical skills mentioned in text, in order of first mention"""
+        found = {}
+        for match in self.pattern.finditer(ParsedDocument.of(text).lower):
+            canonical = self.aliases[_normalize(match.group(1))]
+            found.setdefault(canonical, None)
+        return list(found)
+
+
+@lru_cache(maxsize=None)
+def get_skill_engine(path: Optional[str] = None) -> SkillEngine:
+    """Return the shared skill engine for a taxonomy file, compiling it once"""
+    return SkillEngine.from_file(path or Config.SKILLS_TAXONOMY_PATH)
@@ -0,0 +1,130 @@
+import heapq
+import math
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.skill_engine import SkillEngine, get_skill_engine
+
+_QUERY_TOKEN = re.compile(r'\(|\)|"[^"]*"|[^\s()"]+')
+_OPERATORS = {'and', 'or', 'not'}
+
+
+class SkillIndex:
+    """Inverted index from canonical skill to the ids of candidates that have it"""
+
+    def __init__(self, skill_engine: Optional[SkillEngine] = None):
+        self.skill_engine = skill_engine or get_skill_engine()
+        self.postings: Dict[str, Set[int]] = {}
+        self.candidate_skills: Dict[int, Set[str]] = {}
+
+    def add(self, candidate_id: int, skills: Iterable[str]):
+        """Index a candidate's skills, replacing any previous entry for the id"""
+        self.remove(candidate_id)
+        canonical = {self.skill_engine.canonical(skill) for skill in skills}
+        self.candidate_skills[candidate_id] = canonical
+        for skill in canonical:
+            self.postings.setdefault(skill, set()).add(candidate_id)
+
+    def remove(self, candidate_id: int):
+        for skill in self.candidate_skills.pop(candidate_id, ()):
+            posting = self.postings[skill]
+            posting.discard(candidate_id)
+            if not posting:
+                del self.postings[skill]
+
+    def __len__(self) -> int:
+        return len(self.candidate_skills)
+
+    def candidates_with(self, skill: str) -> Set[int]:
+        return self.postings.get(self.skill_engine.canonical(skill), set())
+
+    def idf(self, skill: str) -> float:
+        """Rarer skills count for more when ranking"""
+        frequency = len(self.candidates_with(skill))
+        return math.log((len(self) + 1) / (frequency + 1)) + 1
+
+    def search(self, query: str) -> Set[int]:
+        """Ids of candidates satisfying a boolean skill query such as 'python AND (django OR flask) AND NOT php'"""
+        tokens = self._tokenize(query)
+        if not tokens:
+            return set(self.candidate_skills)
+
+        result, position = self._parse_or(tokens, 0)
+        if position != len(tokens):
+            raise ValueError(f"Unexpected '{tokens[position]}' in skill query")
+        return result
+
+    def rank(self, skills: List[str], weights: Optional[Dict[str, float]] = None,
+             query: Optional[str] = None, top_k: int = 50) -> List[Tuple[int, float]]:
+        """(candidate_id, score) pairs, best first, by the weighted fraction of the given skills each has"""
+        canonical = list(dict.fromkeys(self.skill_engine.canonical(skill) for skill in skills))
+        if weights is None:
+            weights = {skill: self.idf(skill) for skill in canonical}
+        else:
+            weights = {self.skill_engine.canonical(skill): weight for skill, weight in weights.items()}
+        total = sum(weights.get(skill, 0.0) for skill in canonical)
+        allowed = self.search(query) if query else None
+
+        scores: Dict[int, float] = {}
+        for skill in canonical:
+            weight = weights.get(skill, 0.0)
+            for candidate_id in self.postings.get(skill, ()):
+                if allowed is None or candidate_id in allowed:
+                    scores[candidate_id] = scores.get(candidate_id, 0.0) + weight
+
+        if total <= 0:
+            return []
+        top = heapq.nlargest(top_k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(candidate_id, score / total) for candidate_id, score in top]
+
+    def _tokenize(self, query: str) -> List[str]:
+        """Split a query into parentheses, operators and (multi-word) skill terms"""
+        tokens = []
+        words = []
+        for token in _QUERY_TOKEN.findall(query):
+            if token in ('(', ')') or token.lower() in _OPERATORS:
+                if words:
+                    tokens.append(' '.join(words))
+                    words = []
+                tokens.append(token if token in ('(', ')') else token.upper())
+            elif token.startswith('"'):
+                if words:
+                    tokens.append(' '.join(words))
+                    words = []
+                tokens.append(token.strip('"'))
+            else:
+                words.append(token)
+        if words:
+            tokens.append(' '.join(words))
+        return tokens
+
+    def _parse_or(self, tokens: List[str], position: int) -> Tuple[Set[int], int]:
+        result, position = self._parse_and(tokens, position)
+        while position < len(tokens) and tokens[position] == 'OR':
+            right, position = self._parse_and(tokens, position + 1)
+            result = result | right
+        return result, position
+
+    def _parse_and(self, tokens: List[str], position: int) -> Tuple[Set[int], int]:
+        result, position = self._parse_not(tokens, position)
+        while position < len(tokens) and tokens[position] == 'AND':
+            right, position = self._parse_not(tokens, position + 1)
+            result = result & right
+        return result, position
+
+    def _parse_not(self, tokens: List[str], position: int) -> Tuple[Set[int], int]:
+        if position >= len(tokens):
+            raise ValueError("Skill query ends unexpectedly")
+
+        token = tokens[position]
+        if token == 'NOT':
+            operand, position = self._parse_not(tokens, position + 1)
+            return set(self.candidate_skills) - operand, position
+        if token == '(':
+            result, position = self._parse_or(tokens, position + 1)
+            if position >= len(tokens) or tokens[position] != ')':
+                raise ValueError("Missing ')' in skill query")
+            return result, position + 1
+        if token in ('AND', 'OR', ')'):
+            raise ValueError(f"Unexpected '{token}' in skill query")
+        return set(self.candidates_with(token)), position + 1